@@ -1,11 +1,115 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import time
+from typing import NamedTuple
 
-from models import RoomType, ActorType, EquipmentState
+from models import ActorType, EquipmentState, ROOM_NAME, ACTOR_NAME
 from simulation import HospitalSimulation
 from metrics import ActivityLogger, MetricsTracker, PerformanceAnalyzer
 
+# Cell size (px) of the actor hit-test grid; actors are hit within 15px
+_GRID_CELL = 30
+
+# Activity panel keeps the last 200 lines, trimmed in bulk once it passes 220
+_LOG_KEEP_LINES = 200
+_LOG_TRIM_AT = 220
+
+# Static sidebar text
+_WORKFLOW_STEPS = (
+    "1. Staff enters → Equipment starts",
+    "2. Doctor enters → Waits for ready",
+    "3. Patient enters → Examination begins",
+    "4. Idle 10s → Sleep mode (10% power)",
+    "5. Empty 30s → Equipment shuts down"
+)
+
+_PERFORMANCE_LABELS = (
+    'Total Tasks', 'Examinations Done', 'Prediction Accuracy',
+    'Time Saved (s)', 'Time Lost (s)', 'Net Time Benefit (s)',
+    'Current Power (kW)', 'Total Power (kW)', 'Energy Saved (kWh)'
+)
+
+_LEGEND_ITEMS = (
+    "Staff (Blue) - RFID: S001",
+    "Doctor (Green) - RFID: D001",
+    "Patient (Red) - RFID: P001",
+    "Sleep Mode = 10% Power",
+    "Drag & Drop to Move",
+    "Watch time/energy savings!"
+)
+
+# Static room backgrounds: (title, x, y, width, height, color)
+_ROOMS_LAYOUT = (
+    ("Radiology", 0, 0, 300, 200, "lightgreen"),
+    ("ICU", 0, 200, 300, 200, "lightcoral"),
+    ("Lobby", 300, 0, 300, 200, "lightblue"),
+    ("Laboratory", 300, 200, 300, 200, "lightyellow"),
+    ("Patient Room", 600, 0, 300, 200, "plum1"),
+    ("Emergency Room", 600, 200, 300, 200, "red")
+)
+
+# Equipment indicator boxes: size (px) and boxes per row within a room
+_EQUIPMENT_WIDTH = 60
+_EQUIPMENT_HEIGHT = 40
+_EQUIPMENT_PER_ROW = 2
+
+class _StateStyle(NamedTuple):
+    """Canvas style of an equipment box for one state"""
+    color: str
+    short: str
+    sleep_glyph: bool
+    progress: bool
+
+_STATE_COLOR = {
+    EquipmentState.OFF: "gray",
+    EquipmentState.STARTING: "orange",
+    EquipmentState.PRELOADED: "yellow",
+    EquipmentState.READY: "green",
+    EquipmentState.IN_USE: "blue",
+    EquipmentState.SLEEP: "purple",
+    EquipmentState.SHUTTING_DOWN: "red"
+}
+
+# Enum strings sliced once instead of on every draw
+_STATE_SHORT = {state: state.value[:4] for state in EquipmentState}
+_ACTOR_INITIAL = {actor_type: actor_type.value[0] for actor_type in ActorType}
+
+_STATE_STYLE = {
+    state: _StateStyle(_STATE_COLOR[state], _STATE_SHORT[state],
+                       state == EquipmentState.SLEEP,
+                       state in (EquipmentState.STARTING, EquipmentState.SHUTTING_DOWN))
+    for state in EquipmentState
+}
+
+# Status panel text per state; formatters take (equipment, now)
+_STATUS_FMT = {
+    EquipmentState.OFF: lambda e, now: "OFF",
+    EquipmentState.STARTING: lambda e, now:
+        f"STARTING ({max(0, e.startup_time - (now - e.state_change_time)):.1f}s)",
+    EquipmentState.PRELOADED: lambda e, now: "PRELOADED",
+    EquipmentState.READY: lambda e, now: "READY",
+    EquipmentState.IN_USE: lambda e, now: "IN USE",
+    EquipmentState.SLEEP: lambda e, now: "SLEEP (10% power)",
+    EquipmentState.SHUTTING_DOWN: lambda e, now:
+        f"SHUTTING DOWN ({max(0, e.shutdown_time - (now - e.state_change_time)):.1f}s)"
+}
+
+_ACTOR_COLOR = {
+    ActorType.STAFF: "blue",
+    ActorType.DOCTOR: "green",
+    ActorType.PATIENT: "red"
+}
+
+# Equipment panel line templates
+_ROOM_HEADER_TMPL = "\n{rt} {si} 👨‍⚕️×{dc} 🤒×{pc} {ei}\n".format
+_EQUIP_LINE_TMPL = "  {name}: {status}{power_info}\n".format
+
+# Equipment panel banner keyed by predictive mode
+_MODE_BANNER = {
+    True: "🔮 PREDICTIVE",
+    False: "⏰ TRADITIONAL"
+}
+
 class HospitalGUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -24,14 +128,52 @@ class HospitalGUI:
         self.selected_actor = None
         self.drag_start_x = 0
         self.drag_start_y = 0
+        self._drag_pending = False
+        
+        # Spatial hash of drawn actors for O(1) hit-testing
+        self._actor_grid = {}
+        self._actor_cells = {}
+        self._hover_after_id = None
+        self._hover_pos = (0, 0)
+        
+        # Performance report popup, created on first use and then reused
+        self._report_window = None
+        self._report_text_widget = None
+        self._report_content = ""
+        
+        # Lines waiting to be appended to the activity panel on the next flush
+        self._log_pending = []
+        self._activity_line_count = 0
+        self._log_after_id = None
+        
+        # Pending coalesced redraw of the parts flagged dirty (at most every 100ms)
+        self._refresh_after_id = None
+        
+        # Equipment panel text last written, so unchanged refreshes skip the widget
+        self._equipment_text_shown = None
+        
+        # The layout is fixed, so rooms can be looked up by their top-left corner
+        self._room_at_position = {room.position: rt for rt, room in self.simulation.rooms.items()}
+        
+        # Canvas item IDs for the static room backgrounds, keyed by RoomType
+        self._room_items = {}
         
         self.running = True
+        self._setup_done = False
+        self._bind_mode_handlers(True)
         self.setup_gui()
         
         self.schedule_updates()
         
     def setup_gui(self):
-        """Setup the complete GUI interface"""
+        """Setup the complete GUI interface.
+        
+        Runs exactly once; reset_simulation only clears data and canvas items
+        and never recreates widgets.
+        """
+        assert not self._setup_done, "setup_gui must only run once"
+        self._setup_done = True
+        
         # Main frame
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -87,14 +229,7 @@ class HospitalGUI:
         workflow_frame = ttk.LabelFrame(control_frame, text="🏥 Hospital Workflow")
         workflow_frame.pack(fill=tk.X, pady=(0, 10))
         
-        workflow_steps = [
-            "1. Staff enters → Equipment starts",
-            "2. Doctor enters → Waits for ready",
-            "3. Patient enters → Examination begins",
-            "4. Idle 10s → Sleep mode (10% power)",
-            "5. Empty 30s → Equipment shuts down"
-        ]
-        for step in workflow_steps:
+        for step in _WORKFLOW_STEPS:
             ttk.Label(workflow_frame, text=step, font=("Arial", 8)).pack(anchor='w')
         
         # Actor Management
@@ -115,15 +250,12 @@ class HospitalGUI:
         performance_frame.pack(fill=tk.X, pady=(0, 10))
         
         self.performance_metrics = {}
-        performance_labels = [
-            'Total Tasks', 'Examinations Done', 'Prediction Accuracy',
-            'Time Saved (s)', 'Time Lost (s)', 'Net Time Benefit (s)',
-            'Current Power (kW)', 'Total Power (kW)' ,'Energy Saved (kWh)'
-        ]
-        for metric in performance_labels:
-            label = ttk.Label(performance_frame, text=f"{metric}: 0", font=("Arial", 8))
+        self._last_metric_text = {}
+        for metric in _PERFORMANCE_LABELS:
+            var = tk.StringVar(value=f"{metric}: 0")
+            label = ttk.Label(performance_frame, textvariable=var, font=("Arial", 8))
             label.pack(anchor='w')
-            self.performance_metrics[metric] = label
+            self.performance_metrics[metric] = var
         
         # Control Buttons
         control_buttons_frame = ttk.Frame(control_frame)
@@ -140,15 +272,7 @@ class HospitalGUI:
         legend_frame = ttk.LabelFrame(control_frame, text="Legend")
         legend_frame.pack(fill=tk.X, pady=(10, 0))
         
-        legend_items = [
-            "Staff (Blue) - RFID: S001",
-            "Doctor (Green) - RFID: D001", 
-            "Patient (Red) - RFID: P001",
-            "Sleep Mode = 10% Power",
-            "Drag & Drop to Move",
-            "Watch time/energy savings!"
-        ]
-        for item in legend_items:
+        for item in _LEGEND_ITEMS:
             ttk.Label(legend_frame, text=item, font=("Arial", 8)).pack(anchor='w')
         
         # Right panel for visualization
@@ -179,7 +303,8 @@ class HospitalGUI:
         equipment_frame = ttk.LabelFrame(info_frame, text="Real-time Equipment Status")
         equipment_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         
-        self.equipment_text = tk.Text(equipment_frame, height=14, width=40, font=("Consolas", 9))
+        self.equipment_text = tk.Text(equipment_frame, height=14, width=40, font=("Consolas", 9),
+                                      state=tk.DISABLED)
         eq_scrollbar = ttk.Scrollbar(equipment_frame, orient="vertical", command=self.equipment_text.yview)
         self.equipment_text.configure(yscrollcommand=eq_scrollbar.set)
         self.equipment_text.pack(side="left", fill="both", expand=True)
@@ -189,14 +314,18 @@ class HospitalGUI:
         activity_frame = ttk.LabelFrame(info_frame, text="Hospital Activity Log")
         activity_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
         
-        self.activity_text = tk.Text(activity_frame, height=14, width=40, font=("Consolas", 9))
+        self.activity_text = tk.Text(activity_frame, height=14, width=40, font=("Consolas", 9),
+                                     state=tk.DISABLED)
         activity_scrollbar = ttk.Scrollbar(activity_frame, orient="vertical", command=self.activity_text.yview)
         self.activity_text.configure(yscrollcommand=activity_scrollbar.set)
         self.activity_text.pack(side="left", fill="both", expand=True)
         activity_scrollbar.pack(side="right", fill="y")
+        # <Map> on the toplevel is delivered on deiconify, unlike on already-mapped children
+        self.root.bind("<Map>", self._on_panel_shown)
         
         # Initialize display
-        self.draw_hospital_layout()
+        self._draw_rooms_static()
+        self.equipment_update()
         
         # Add initial actors for demo
         self.add_actor(ActorType.STAFF)
@@ -208,18 +337,45 @@ class HospitalGUI:
         self.root.after(500, self.update_display)
         
     def schedule_updates(self):
-        """Schedule all update loops for real-time simulation"""
+        """Schedule all update loops, redrawing only the parts flagged dirty"""
         if self.running:
-            self.equipment_update()
-            self.room_update()
-            self.update_display()
-            self.update_all_metrics()
+            self._tick_fn()
+            self.request_refresh()
             self.root.after(1000, self.schedule_updates)
     
+    def _on_panel_shown(self, event=None):
+        """Bring the status panels up to date once they become visible again"""
+        # The toplevel's bindings also see <Map> events of its children
+        if event is not None and event.widget is not self.root:
+            return
+        self.simulation.dirty['equipment'] = True
+        self.request_refresh()
+        if self._log_after_id is None:
+            self._log_after_id = self.root.after(50, self.flush_activity_log)
+    
+    def request_refresh(self):
+        """Schedule one redraw of the dirty display parts, coalescing requests within 100ms"""
+        if self._refresh_after_id is None:
+            self._refresh_after_id = self.root.after(100, self._refresh_dirty)
+    
+    def _refresh_dirty(self):
+        self._refresh_after_id = None
+        dirty = self.simulation.dirty
+        if dirty['equipment']:
+            # Stays dirty when the panel text was skipped, so it is rebuilt once shown
+            dirty['equipment'] = not self.equipment_update()
+        if dirty['actors']:
+            self.draw_actors()
+            dirty['actors'] = False
+        if dirty['metrics']:
+            self.update_all_metrics()
+            dirty['metrics'] = False
+    
     def toggle_mode(self):
         """Toggle between predictive and traditional mode"""
         predictive = self.mode_var.get()
         self.simulation.set_predictive_mode(predictive)
+        self._bind_mode_handlers(predictive)
         
         if predictive:
             self.mode_desc.config(text="Equipment preloading based on movement patterns", foreground="green")
@@ -230,19 +386,31 @@ class HospitalGUI:
         
         self.log_activity(mode_msg)
     
+    def _bind_mode_handlers(self, predictive: bool):
+        """Resolve the per-mode tick and auto demo once, instead of branching every tick"""
+        if predictive:
+            self._tick_fn = self._tick_predictive
+            self._start_auto_fn = self.start_predictive_auto_simulation
+        else:
+            self._tick_fn = self._tick_traditional
+            self._start_auto_fn = self.start_auto_simulation
+    
     def start_manual_mode(self):
         """Enable manual drag & drop control"""
         self.simulation.auto_simulation_running = False
         self.log_activity("MANUAL MODE: Drag actors between rooms")
     def pick_simulation(self):
-        if self.mode_var.get()==False:
-            self.start_auto_simulation()
-        else:
-            self.simulation.auto_simulation_running = True
-            self.auto_simulation_predictive_loop()
+        self._start_auto_fn()
+    
+    def start_predictive_auto_simulation(self):
+        """Start the predictive auto demo with equipment preloading"""
+        self.simulation.auto_simulation_running = True
+        self.auto_simulation_predictive_loop()
+    
     def start_auto_simulation(self):
         """Start realistic automated hospital workflow demo"""
         if not self.simulation.actors:
+            from tkinter import messagebox
             messagebox.showwarning("Warning", "Please add actors first!")
             return
         self.simulation.auto_simulation_running = True
@@ -272,117 +440,147 @@ class HospitalGUI:
                 self.log_activity("AUTO DEMO: Cycle complete, restarting...")
                 self.root.after(5000, self.auto_simulation_loop)
     
-    def draw_hospital_layout(self):
-        """Draw the hospital layout with equipment visualization"""
-        self.canvas.delete("room")
-        
-        rooms_layout = [
-            ("Radiology", 0, 0, 300, 200, "lightgreen"),
-            ("ICU", 0, 200, 300, 200, "lightcoral"),
-            ("Lobby", 300, 0, 300, 200, "lightblue"),
-            ("Laboratory", 300, 200, 300, 200, "lightyellow"),
-            ("Patient Room", 600, 0, 300, 200, "plum1"),
-            ("Emergency Room", 600, 200, 300, 200, "red")
-        ]
-        
-        for name, x, y, w, h, color in rooms_layout:
-            self.canvas.create_rectangle(x, y, x+w, y+h, fill=color, outline="black", 
-                                       width=3, tags="room")
-            
-            self.canvas.create_text(x+w//2, y+15, text=f"{name}", 
-                                  font=("Arial", 12, "bold"), tags="room")
-            
-            # Find corresponding room and draw equipment
-            room_type = None
-            for rt, room in self.simulation.rooms.items():
-                if room.position == (x, y):
-                    room_type = rt
-                    break
-            
-            if room_type and room_type != RoomType.LOBBY:
-                room = self.simulation.rooms[room_type]
-                self.draw_room_equipment(room, x, y, w, h)
-    
-    def draw_room_equipment(self, room, x, y, w, h):
-        """Draw equipment status indicators in each room"""
-        equipment_per_row = 2
-        eq_width = 60
-        eq_height = 40
-        start_x = x + 20
-        start_y = y + 40
-        
-        for i, equipment in enumerate(room.equipment):
-            row = i // equipment_per_row
-            col = i % equipment_per_row
-            eq_x = start_x + col * (eq_width + 20)
-            eq_y = start_y + row * (eq_height + 10)
-            
-            # Equipment state colors
-            state_colors = {
-                EquipmentState.OFF: "gray",
-                EquipmentState.STARTING: "orange", 
-                EquipmentState.PRELOADED: "yellow",
-                EquipmentState.READY: "green",
-                EquipmentState.IN_USE: "blue",
-                EquipmentState.SLEEP: "purple",
-                EquipmentState.SHUTTING_DOWN: "red"
+    def _draw_rooms_static(self):
+        """Draw the room backgrounds and titles once; they never change"""
+        for name, x, y, w, h, color in _ROOMS_LAYOUT:
+            room_type = self._room_at_position.get((x, y))
+            self._room_items[room_type] = {
+                'rect': self.canvas.create_rectangle(x, y, x+w, y+h, fill=color, outline="black", 
+                                                     width=3, tags="static"),
+                'title': self.canvas.create_text(x+w//2, y+15, text=f"{name}", 
+                                                 font=("Arial", 12, "bold"), tags="static")
             }
+    
+    def equipment_update(self):
+        """Update equipment states, canvas indicators and the status panel; False if the panel was skipped"""
+        # The panel text is only rebuilt while visible; <Map> triggers a refresh on show
+        panel_visible = self.equipment_text.winfo_viewable()
+        
+        # Header
+        mode = _MODE_BANNER[self.simulation.predictive_mode]
+        lines = [f"Equipment Status - {mode} MODE\n", "=" * 45 + "\n\n"]
+        now = time.monotonic()
+        
+        for room_type, room in self.simulation.rooms.items():
+            if not room.equipment:
+                continue
             
-            color = state_colors.get(equipment.state, "gray")
+            # Room header with occupancy
+            staff_icon = "👩‍⚕️" if room.staff_present else "🚫"
+            exam_icon = "📋" if room.examination_in_progress else ""
+            doctor_count = len(room.doctors_present)
+            patient_count = len(room.patients_present)
             
+            lines.append(_ROOM_HEADER_TMPL(rt=ROOM_NAME[room_type], si=staff_icon, dc=doctor_count,
+                                           pc=patient_count, ei=exam_icon))
+            lines.append("-" * 30 + "\n")
+            
+            x, y = room.position
+            for i, equipment in enumerate(room.equipment):
+                equipment.update_state(now)
+                
+                row, col = divmod(i, _EQUIPMENT_PER_ROW)
+                self.draw_equipment_item(equipment, x + 20 + col * (_EQUIPMENT_WIDTH + 20),
+                                         y + 40 + row * (_EQUIPMENT_HEIGHT + 10), now)
+                if panel_visible:
+                    lines.append(self.format_equipment_line(equipment, now))
+        
+        if not panel_visible:
+            return False
+        
+        text = "".join(lines)
+        if text != self._equipment_text_shown:
+            self.replace_text(self.equipment_text, text)
+            self._equipment_text_shown = text
+        return True
+    
+    def draw_equipment_item(self, equipment, eq_x, eq_y, now: float = None):
+        """Draw one equipment status indicator, reusing its cached canvas items"""
+        eq_width = _EQUIPMENT_WIDTH
+        eq_height = _EQUIPMENT_HEIGHT
+        bar_width = eq_width - 10
+        bar_x = eq_x + 5
+        bar_y = eq_y + eq_height - 8
+        
+        ids = equipment.canvas_ids
+        if not ids:
             # Equipment box
-            self.canvas.create_rectangle(eq_x, eq_y, eq_x+eq_width, eq_y+eq_height,
-                                       fill=color, outline="black", width=2, tags="room")
+            ids['box'] = self.canvas.create_rectangle(eq_x, eq_y, eq_x+eq_width, eq_y+eq_height,
+                                                      fill="gray", outline="black", width=2, tags="equipment")
             
             # Equipment name
             short_name = equipment.name.split()[0][:8]
-            self.canvas.create_text(eq_x + eq_width//2, eq_y + 10, text=short_name,
-                                  font=("Arial", 8, "bold"), tags="room", fill="white")
+            ids['name'] = self.canvas.create_text(eq_x + eq_width//2, eq_y + 10, text=short_name,
+                                                  font=("Arial", 8, "bold"), tags="equipment", fill="white")
             
             # State indicator
-            state_text = equipment.state.value[:4]
-            self.canvas.create_text(eq_x + eq_width//2, eq_y + 22, text=state_text,
-                                  font=("Arial", 7), tags="room", fill="white")
+            ids['state'] = self.canvas.create_text(eq_x + eq_width//2, eq_y + 22, text="",
+                                                   font=("Arial", 7), tags="equipment", fill="white")
             
-            # Special indicators
-            if equipment.state == EquipmentState.SLEEP:
-                self.canvas.create_text(eq_x + eq_width//2, eq_y + 32, text="💤",
-                                      font=("Arial", 10), tags="room")
-            elif equipment.state in [EquipmentState.STARTING, EquipmentState.SHUTTING_DOWN]:
-                progress = equipment.get_progress()
-                bar_width = eq_width - 10
-                bar_x = eq_x + 5
-                bar_y = eq_y + eq_height - 8
-                
-                self.canvas.create_rectangle(bar_x, bar_y, bar_x + bar_width, bar_y + 4,
-                                           fill="white", outline="black", tags="room")
-                if progress > 0:
-                    fill_width = bar_width * progress
-                    self.canvas.create_rectangle(bar_x, bar_y, bar_x + fill_width, bar_y + 4,
-                                               fill="darkgreen", outline="", tags="room")
+            # Special indicators, shown only in the matching states
+            ids['sleep'] = self.canvas.create_text(eq_x + eq_width//2, eq_y + 32, text="💤",
+                                                   font=("Arial", 10), tags="equipment", state=tk.HIDDEN)
+            ids['bar'] = self.canvas.create_rectangle(bar_x, bar_y, bar_x + bar_width, bar_y + 4,
+                                                      fill="white", outline="black", tags="equipment",
+                                                      state=tk.HIDDEN)
+            ids['fill'] = self.canvas.create_rectangle(bar_x, bar_y, bar_x, bar_y + 4,
+                                                       fill="darkgreen", outline="", tags="equipment",
+                                                       state=tk.HIDDEN)
+            
+            # Keep actors above newly created equipment
+            self.canvas.tag_raise("actor")
+        
+        state = equipment.state
+        style = _STATE_STYLE[state]
+        
+        if state != equipment.drawn_state:
+            self.canvas.itemconfig(ids['box'], fill=style.color)
+            self.canvas.itemconfig(ids['state'], text=style.short)
+            self.canvas.itemconfig(ids['sleep'], state=tk.NORMAL if style.sleep_glyph else tk.HIDDEN)
+            bar_state = tk.NORMAL if style.progress else tk.HIDDEN
+            self.canvas.itemconfig(ids['bar'], state=bar_state)
+            self.canvas.itemconfig(ids['fill'], state=bar_state)
+            equipment.drawn_state = state
+        
+        if style.progress:
+            progress = equipment.get_progress(now)
+            self.canvas.coords(ids['fill'], bar_x, bar_y, bar_x + bar_width * progress, bar_y + 4)
+    
+    def format_equipment_line(self, equipment, now: float):
+        """Format one equipment line of the status panel"""
+        power = equipment.get_current_power_consumption(now)
+        
+        # Status with timing information
+        status = _STATUS_FMT[equipment.state](equipment, now)
+        
+        power_info = f" | {power:.0f}W" if power > 0 else " | 0W"
+        return _EQUIP_LINE_TMPL(name=equipment.name, status=status, power_info=power_info)
     
     def add_actor(self, actor_type: ActorType):
         """Add a new actor"""
         actor = self.simulation.add_actor(actor_type)
-        self.log_activity(f"Added {actor_type.value} #{actor.actor_id} (Tag: {actor.tag_id})")
+        self.log_activity(f"Added {ACTOR_NAME[actor_type]} #{actor.actor_id} (Tag: {actor.tag_id})")
         self.draw_actors()
         return actor
     
     def remove_selected_actor(self):
         """Remove the currently selected actor"""
         if self.selected_actor:
-            actor_info = f"{self.selected_actor.actor_type.value} #{self.selected_actor.actor_id}"
+            actor_info = f"{ACTOR_NAME[self.selected_actor.actor_type]} #{self.selected_actor.actor_id}"
             tag_info = self.selected_actor.tag_id
+            self.delete_actor_items(self.selected_actor)
             self.simulation.remove_actor(self.selected_actor)
             self.selected_actor = None
             self.log_activity(f"Removed {actor_info} (Tag: {tag_info})")
         else:
+            from tkinter import messagebox
             messagebox.showinfo("Selection Required", "Please select an actor first by clicking on it.")
     
     def show_performance_report(self):
         """Show comprehensive performance report with recommendations"""
         summary = self.simulation.get_performance_summary()
         analysis = self.metrics_tracker.get_movement_analysis()
+        
         recommendations = self.performance_analyzer.generate_recommendations(self.simulation)
         
         report = f"""
@@ -429,10 +627,26 @@ RECOMMENDATIONS:
 {'Energy efficiency through sleep mode!' if summary['energy_efficiency_percent'] > 5 else ' Monitor energy consumption patterns'}
         """
         
-        # Create popup window for report
+        if self._report_window is None:
+            self._create_report_window()
+        else:
+            self._report_window.deiconify()
+            self._report_window.lift()
+        
+        # Repopulate the persistent Text widget in place
+        self._report_text_widget.config(state=tk.NORMAL)
+        self._report_text_widget.delete(1.0, tk.END)
+        self._report_text_widget.insert(tk.END, report)
+        self._report_text_widget.config(state=tk.DISABLED)
+        
+        self._report_content = report
+    
+    def _create_report_window(self):
+        """Create the report popup once; closing it only hides it"""
         report_window = tk.Toplevel(self.root)
         report_window.title("Performance Report - Smart Hospital System")
         report_window.geometry("700x600")
+        report_window.protocol("WM_DELETE_WINDOW", report_window.withdraw)
         
         text_widget = tk.Text(report_window, wrap=tk.WORD, font=("Consolas", 10))
         scrollbar = ttk.Scrollbar(report_window, orient="vertical", command=text_widget.yview)
@@ -441,19 +655,20 @@ RECOMMENDATIONS:
         text_widget.pack(side="left", fill=tk.BOTH, expand=True, padx=10, pady=10)
         scrollbar.pack(side="right", fill="y", pady=10)
         
-        text_widget.insert(tk.END, report)
-        text_widget.config(state=tk.DISABLED)
-        
         button_frame = ttk.Frame(report_window)
         button_frame.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Button(button_frame, text="Close Report", 
-                  command=report_window.destroy).pack(side=tk.RIGHT)
+                  command=report_window.withdraw).pack(side=tk.RIGHT)
         ttk.Button(button_frame, text="Export Report", 
-                  command=lambda: self.export_report(report)).pack(side=tk.RIGHT, padx=(0, 5))
+                  command=lambda: self.export_report(self._report_content)).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        self._report_window = report_window
+        self._report_text_widget = text_widget
     
     def export_metrics(self):
         """Export metrics to file"""
+        from tkinter import messagebox
         try:
             filename = f"hospital_metrics_{time.strftime('%Y%m%d_%H%M%S')}.txt"
             result = self.metrics_tracker.export_metrics(filename)
@@ -464,6 +679,7 @@ RECOMMENDATIONS:
     
     def export_report(self, report_content: str):
         """Export performance report to file"""
+        from tkinter import messagebox
         try:
             filename = f"hospital_report_{time.strftime('%Y%m%d_%H%M%S')}.txt"
             with open(filename, 'w') as f:
@@ -475,9 +691,14 @@ RECOMMENDATIONS:
     
     def find_actor_at_position(self, x: int, y: int):
         """Find actor at given canvas coordinates"""
-        for actor in self.simulation.actors:
-            if abs(x - actor.position.x) <= 15 and abs(y - actor.position.y) <= 15:
-                return actor
+        cx, cy = x // _GRID_CELL, y // _GRID_CELL
+        
+        # A 15px hit radius can only reach the neighbouring 30px cells
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for actor in self._actor_grid.get((gx, gy), ()):
+                    if abs(x - actor.x) <= 15 and abs(y - actor.y) <= 15:
+                        return actor
         return None
     
     def on_click(self, event):
@@ -489,16 +710,24 @@ RECOMMENDATIONS:
                 self.drag_start_x = event.x
                 self.drag_start_y = event.y
                 actor.being_dragged = True
+                self.simulation.dirty['actors'] = True
+                self.request_refresh()
                 self.canvas.config(cursor="hand2")
                 
-                self.log_activity(f"👆 Selected {actor.actor_type.value} #{actor.actor_id} (Tag: {actor.tag_id})")
+                self.log_activity(f"👆 Selected {ACTOR_NAME[actor.actor_type]} #{actor.actor_id} (Tag: {actor.tag_id})")
     
     def on_drag(self, event):
-        """Handle mouse drag for actor movement"""
+        """Handle mouse drag for actor movement, redrawing at most ~30 times per second"""
         if self.selected_actor and not self.simulation.auto_simulation_running:
-            self.selected_actor.position.x = event.x
-            self.selected_actor.position.y = event.y
-            self.draw_actors()
+            self.selected_actor.x, self.selected_actor.y = \
+                self.simulation.clamp_position(event.x, event.y)
+            if not self._drag_pending:
+                self._drag_pending = True
+                self.root.after(33, self._flush_drag)
+    
+    def _flush_drag(self):
+        self._drag_pending = False
+        self.draw_actors()
     
     def on_release(self, event):
         """Handle mouse release to complete actor movement"""
@@ -517,20 +746,29 @@ RECOMMENDATIONS:
                 effect_icon = "⚡" if net_effect > 0 else "🐌" if net_effect < 0 else "⚖️"
                 
                 self.log_activity(
-                    f"{effect_icon} {self.selected_actor.actor_type.value} #{self.selected_actor.actor_id}: "
-                    f"{old_room.value} → {self.selected_actor.current_room.value} "
+                    f"{effect_icon} {ACTOR_NAME[self.selected_actor.actor_type]} #{self.selected_actor.actor_id}: "
+                    f"{ROOM_NAME[old_room]} → {ROOM_NAME[self.selected_actor.current_room]} "
                     f"(Net: {net_effect:+.1f}s)"
                 )
             
             # Clean up selection
             self.selected_actor.being_dragged = False
             self.selected_actor = None
+            self.simulation.dirty['actors'] = True
+            self.request_refresh()
             self.canvas.config(cursor="")
     
     def on_hover(self, event):
-        """Handle mouse hover for visual feedback"""
+        """Handle mouse hover for visual feedback, debounced to 50ms"""
+        self._hover_pos = (event.x, event.y)
+        if self._hover_after_id is not None:
+            self.root.after_cancel(self._hover_after_id)
+        self._hover_after_id = self.root.after(50, self._apply_hover)
+    
+    def _apply_hover(self):
+        self._hover_after_id = None
         if not self.selected_actor and not self.simulation.auto_simulation_running:
-            actor = self.find_actor_at_position(event.x, event.y)
+            actor = self.find_actor_at_position(*self._hover_pos)
             self.canvas.config(cursor="hand1" if actor else "")
     
     def reset_simulation(self):
@@ -539,13 +777,21 @@ RECOMMENDATIONS:
         self.simulation.set_predictive_mode(self.mode_var.get())
         self.selected_actor = None
         
+        # Drop canvas items owned by the previous simulation objects
+        self.canvas.delete("equipment", "actor")
+        self._actor_grid.clear()
+        self._actor_cells.clear()
+        
         # Reset metrics and logging
         self.metrics_tracker.reset_metrics()
         self.activity_logger.clear_log()
         
         # Clear displays
-        self.equipment_text.delete(1.0, tk.END)
-        self.activity_text.delete(1.0, tk.END)
+        self.replace_text(self.equipment_text, "")
+        self._equipment_text_shown = ""
+        self.replace_text(self.activity_text, "")
+        self._log_pending.clear()
+        self._activity_line_count = 0
         
         # Log reset
         self.log_activity(" === SYSTEM RESET ===")
@@ -557,48 +803,38 @@ RECOMMENDATIONS:
         self.add_actor(ActorType.DOCTOR) 
         self.add_actor(ActorType.PATIENT)
     
-    def equipment_update(self):
-        """Update all equipment states"""
-        for room in self.simulation.rooms.values():
-            for equipment in room.equipment:
-                equipment.update_state()
-        self.update_equipment_display()
+    def _tick_predictive(self):
+        """Simulation step for predictive mode: idle rooms are shut down"""
+        now = time.monotonic()
+        self.simulation.update_all_rooms(now)
+        self.simulation.shutdown_idle_rooms(now)
+        self.energy_update(now)
     
-    def room_update(self):
-        """Update room states and handle examinations"""
-        self.simulation.update_all_rooms()
-        
-        # Update energy metrics
-        current_power, sleep_savings = self.simulation.calculate_energy_consumption()
+    def _tick_traditional(self):
+        """Simulation step for traditional mode: equipment stays on until used"""
+        now = time.monotonic()
+        self.simulation.update_all_rooms(now)
+        self.energy_update(now)
+    
+    def energy_update(self, now: float = None):
+        """Update energy metrics"""
+        current_power, sleep_savings = self.simulation.calculate_energy_consumption(now)
         energy_consumed = current_power  # Convert to kWh for 1-second interval
         self.metrics_tracker.update_energy_metrics(energy_consumed, sleep_savings)
     
     def update_display(self):
         """Update the complete visual display"""
-        self.draw_hospital_layout()
+        self.equipment_update()
         self.draw_actors()
     
     def draw_actors(self):
-        """Draw all actors with visual representation"""
-        self.canvas.delete("actor")
-        
+        """Draw all actors, moving their cached canvas items in place"""
         for actor in self.simulation.actors:
-            x = actor.position.x
-            y = actor.position.y
+            # Positions are clamped to the layout when they are written
+            x = actor.x
+            y = actor.y
             
-            # Ensure actors stay within canvas bounds
-            x = max(15, min(self.canvas_width-15, x))
-            y = max(15, min(self.canvas_height-15, y))
-            actor.position.x = x
-            actor.position.y = y
-            
-            # Actor colors
-            colors = {
-                ActorType.STAFF: "blue",
-                ActorType.DOCTOR: "green", 
-                ActorType.PATIENT: "red"
-            }
-            color = colors[actor.actor_type]
+            color = _ACTOR_COLOR[actor.actor_type]
             
             # Special highlighting
             if actor.being_dragged:
@@ -610,24 +846,67 @@ RECOMMENDATIONS:
             else:
                 outline_color, outline_width = "black", 2
             
-            # Draw actor circle
-            self.canvas.create_oval(x-12, y-12, x+12, y+12, fill=color, 
-                                  outline=outline_color, tags="actor", width=outline_width)
-            
             # Actor label
-            label_parts = [f"{actor.actor_type.value[0]}{actor.actor_id}"]
+            label_parts = [f"{_ACTOR_INITIAL[actor.actor_type]}{actor.actor_id}"]
             if actor.in_examination:
                 label_parts.append("📋")
             if actor == self.selected_actor:
                 label_parts.append("👆")
             
             label = "".join(label_parts)
-            self.canvas.create_text(x, y-25, text=label, font=("Arial", 10, "bold"), 
-                                  tags="actor", fill="black")
             
-            # Tag ID
-            self.canvas.create_text(x, y+20, text=actor.tag_id, font=("Arial", 7), 
-                                  tags="actor", fill="gray")
+            drawn = (x, y, outline_color, outline_width, label)
+            if drawn == actor.drawn_state:
+                continue
+            
+            if actor.canvas_id is None:
+                # Actor circle, label and tag ID are created once per actor
+                actor.canvas_id = self.canvas.create_oval(x-12, y-12, x+12, y+12, fill=color, 
+                                                          outline=outline_color, tags="actor", width=outline_width)
+                actor.label_id = self.canvas.create_text(x, y-25, text=label, font=("Arial", 10, "bold"), 
+                                                         tags="actor", fill="black")
+                actor.tag_label_id = self.canvas.create_text(x, y+20, text=actor.tag_id, font=("Arial", 7), 
+                                                             tags="actor", fill="gray")
+            else:
+                last_x, last_y, last_outline, last_width, last_label = actor.drawn_state
+                if (x, y) != (last_x, last_y):
+                    self.canvas.coords(actor.canvas_id, x-12, y-12, x+12, y+12)
+                    self.canvas.coords(actor.label_id, x, y-25)
+                    self.canvas.coords(actor.tag_label_id, x, y+20)
+                if (outline_color, outline_width) != (last_outline, last_width):
+                    self.canvas.itemconfig(actor.canvas_id, outline=outline_color, width=outline_width)
+                if label != last_label:
+                    self.canvas.itemconfig(actor.label_id, text=label)
+            
+            actor.drawn_state = drawn
+            self.update_actor_cell(actor)
+    
+    def update_actor_cell(self, actor):
+        """Move an actor to the hit-test grid cell matching its drawn position"""
+        cell = (actor.x // _GRID_CELL, actor.y // _GRID_CELL)
+        old_cell = self._actor_cells.get(actor)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self._remove_from_cell(actor, old_cell)
+        self._actor_grid.setdefault(cell, []).append(actor)
+        self._actor_cells[actor] = cell
+    
+    def _remove_from_cell(self, actor, cell):
+        bucket = self._actor_grid[cell]
+        bucket.remove(actor)
+        if not bucket:
+            del self._actor_grid[cell]
+    
+    def delete_actor_items(self, actor):
+        """Remove an actor's cached canvas items and grid entry"""
+        if actor.canvas_id is not None:
+            self.canvas.delete(actor.canvas_id, actor.label_id, actor.tag_label_id)
+            actor.canvas_id = actor.label_id = actor.tag_label_id = None
+            actor.drawn_state = None
+        cell = self._actor_cells.pop(actor, None)
+        if cell is not None:
+            self._remove_from_cell(actor, cell)
     
     def update_all_metrics(self):
         """Update all performance metrics displays"""
@@ -635,83 +914,23 @@ RECOMMENDATIONS:
         current_power, sleep_savings = self.simulation.calculate_energy_consumption()
         summary = self.metrics_tracker.get_performance_summary()
         
-        # Update metrics
-        self.performance_metrics['Total Tasks'].config(
-            text=f"Total Tasks: {summary['total_tasks']}"
-        )
-        self.performance_metrics['Examinations Done'].config(
-            text=f"Examinations Done: {summary['examinations']}"
-        )
-        self.performance_metrics['Prediction Accuracy'].config(
-            text=f"Prediction Accuracy: {summary['prediction_accuracy']:.1f}%"
-        )
-        self.performance_metrics['Time Saved (s)'].config(
-            text=f"Time Saved (s): {summary['time_saved_total']:.1f}"
-        )
-        self.performance_metrics['Time Lost (s)'].config(
-            text=f"Time Lost (s): {summary['time_lost_total']:.1f}"
-        )
-        self.performance_metrics['Net Time Benefit (s)'].config(
-            text=f"Net Time Benefit (s): {summary['net_time_benefit']:+.1f}"
-        )
-        self.performance_metrics['Current Power (kW)'].config(
-            text=f"Current Power (kW): {current_power/1000:.2f}"
-        )
-        self.performance_metrics['Total Power (kW)'].config(
-            text=f"Total Power (kW): {summary['energy_consumed_kwh']:.2f}"
-        )
-        self.performance_metrics['Energy Saved (kWh)'].config(
-            text=f"Energy Saved (kWh): {summary['energy_saved_kwh']:.3f}"
-        )
-    
-    def update_equipment_display(self):
-        """Update the equipment status display"""
-        self.equipment_text.delete(1.0, tk.END)
-        
-        # Header
-        mode = "🔮 PREDICTIVE" if self.simulation.predictive_mode else "⏰ TRADITIONAL"
-        self.equipment_text.insert(tk.END, f"Equipment Status - {mode} MODE\n")
-        self.equipment_text.insert(tk.END, "=" * 45 + "\n\n")
-        
-        for room_type, room in self.simulation.rooms.items():
-            if room.equipment:
-                # Room header with occupancy
-                staff_icon = "👩‍⚕️" if room.staff_present else "🚫"
-                exam_icon = "📋" if room.examination_in_progress else ""
-                doctor_count = len(room.doctors_present)
-                patient_count = len(room.patients_present)
-                
-                self.equipment_text.insert(tk.END, 
-                    f"\n{room_type.value} {staff_icon} 👨‍⚕️×{doctor_count} 🤒×{patient_count} {exam_icon}\n")
-                self.equipment_text.insert(tk.END, "-" * 30 + "\n")
-                
-                # Equipment details
-                for equipment in room.equipment:
-                    power = equipment.get_current_power_consumption()
-                    
-                    # Status with timing information
-                    if equipment.state == EquipmentState.OFF:
-                        status = "OFF"
-                    elif equipment.state == EquipmentState.STARTING:
-                        remaining = max(0, equipment.startup_time - (time.time() - equipment.state_change_time))
-                        status = f"STARTING ({remaining:.1f}s)"
-                    elif equipment.state == EquipmentState.PRELOADED:
-                        status = "PRELOADED"
-                    elif equipment.state == EquipmentState.READY:
-                        status = "READY"
-                    elif equipment.state == EquipmentState.IN_USE:
-                        status = f"IN USE"
-                    elif equipment.state == EquipmentState.SLEEP:
-                        status = "SLEEP (10% power)"
-                    elif equipment.state == EquipmentState.SHUTTING_DOWN:
-                        remaining = max(0, equipment.shutdown_time - (time.time() - equipment.state_change_time))
-                        status = f"SHUTTING DOWN ({remaining:.1f}s)"
-                    
-                    power_info = f" | {power:.0f}W" if power > 0 else " | 0W"
-                    self.equipment_text.insert(tk.END, f"  {equipment.name}: {status}{power_info}\n")
-        
-        # Auto-scroll to bottom
-        self.equipment_text.see(tk.END)
+        metric_texts = {
+            'Total Tasks': f"Total Tasks: {summary['total_tasks']}",
+            'Examinations Done': f"Examinations Done: {summary['examinations']}",
+            'Prediction Accuracy': f"Prediction Accuracy: {summary['prediction_accuracy']:.1f}%",
+            'Time Saved (s)': f"Time Saved (s): {summary['time_saved_total']:.1f}",
+            'Time Lost (s)': f"Time Lost (s): {summary['time_lost_total']:.1f}",
+            'Net Time Benefit (s)': f"Net Time Benefit (s): {summary['net_time_benefit']:+.1f}",
+            'Current Power (kW)': f"Current Power (kW): {current_power/1000:.2f}",
+            'Total Power (kW)': f"Total Power (kW): {summary['energy_consumed_kwh']:.2f}",
+            'Energy Saved (kWh)': f"Energy Saved (kWh): {summary['energy_saved_kwh']:.3f}"
+        }
+        
+        # Only touch variables whose displayed text actually changed
+        for metric, text in metric_texts.items():
+            if self._last_metric_text.get(metric) != text:
+                self.performance_metrics[metric].set(text)
+                self._last_metric_text[metric] = text
     
     def log_activity(self, message: str):
         """Log activity using the activity logger"""
@@ -721,14 +940,42 @@ RECOMMENDATIONS:
             self.simulation.auto_simulation_running
         )
         
-        # Update the GUI display
-        self.activity_text.insert(tk.END, formatted_message + "\n")
-        self.activity_text.see(tk.END)
+        self._log_pending.append(formatted_message + "\n")
+        if self._log_after_id is None:
+            self._log_after_id = self.root.after(50, self.flush_activity_log)
+    
+    def flush_activity_log(self):
+        """Append pending log lines to the activity panel, trimming old ones in bulk"""
+        self._log_after_id = None
+        if not self._log_pending:
+            return
+        if not self.activity_text.winfo_viewable():
+            # Hold lines until the panel is shown, keeping only what it would display
+            if len(self._log_pending) > _LOG_TRIM_AT:
+                del self._log_pending[:-_LOG_KEEP_LINES]
+            return
+        
+        self.activity_text.configure(state=tk.NORMAL)
+        self.activity_text.insert(tk.END, "".join(self._log_pending))
+        self._activity_line_count += len(self._log_pending)
+        self._log_pending.clear()
         
-        # Keep display manageable (last 200 lines)
-        lines = int(self.activity_text.index('end-1c').split('.')[0])
-        if lines > 200:
-            self.activity_text.delete(1.0, "20.0")
+        # Keep display manageable (last 200 lines), trimming only past 220
+        if self._activity_line_count > _LOG_TRIM_AT:
+            excess = self._activity_line_count - _LOG_KEEP_LINES
+            self.activity_text.delete("1.0", f"{excess + 1}.0")
+            self._activity_line_count = _LOG_KEEP_LINES
+        
+        self.activity_text.configure(state=tk.DISABLED)
+        self.activity_text.see(tk.END)
+    
+    def replace_text(self, widget, content: str):
+        """Swap a read-only Text widget's contents in one delete/insert and scroll to the end"""
+        widget.configure(state=tk.NORMAL)
+        widget.delete(1.0, tk.END)
+        widget.insert(tk.END, content)
+        widget.configure(state=tk.DISABLED)
+        widget.see(tk.END)
     
     def run(self):
         """Start the application"""
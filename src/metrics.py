@@ -1,32 +1,82 @@
 import time
+from array import array
+from collections import OrderedDict, deque
+from itertools import islice
+from operator import attrgetter
 from typing import List, Dict, Any, Optional
-from models import ActorType, RoomType
+from models import ActorType, RoomType, Movement
+
+# Last formatted wall-clock second, reused until the second changes
+_last_second = [0, ""]
+
+def _now_hms() -> str:
+    """Return the current time as HH:MM:SS, formatting at most once per second"""
+    now = int(time.time())
+    if now != _last_second[0]:
+        _last_second[0] = now
+        _last_second[1] = time.strftime("%H:%M:%S", time.localtime(now))
+    return _last_second[1]
+
+# Log line mode tags keyed by (predictive_mode, auto_mode)
+_MODE_PREFIX = {
+    (True, True): "[PRED] [AUTO]",
+    (True, False): "[PRED] [MAN]",
+    (False, True): "[TRAD] [AUTO]",
+    (False, False): "[TRAD] [MAN]"
+}
+
+# Grouping keys read from each logged movement
+_MOVEMENT_KEYS = attrgetter('from_room', 'to_room', 'actor_type')
+
+# Metrics export header; filled from the summary and movement analysis dicts
+_REPORT_HEADER_TMPL = """
+HOSPITAL SIMULATION METRICS REPORT
+Generated: {generated}
+========================================
+
+PERFORMANCE SUMMARY:
+- Runtime: {summary[runtime_minutes]:.2f} minutes
+- Total Tasks: {summary[total_tasks]}
+- Examinations: {summary[examinations]}
+- Prediction Accuracy: {summary[prediction_accuracy]:.1f}%
+- Time Saved: {summary[time_saved_total]:.2f}s
+- Time Lost: {summary[time_lost_total]:.2f}s
+- Net Benefit: {summary[net_time_benefit]:.2f}s
+- Energy Consumed: {summary[energy_consumed_kwh]:.3f} kWh
+- Energy Saved: {summary[energy_saved_kwh]:.3f} kWh
+
+MOVEMENT ANALYSIS:
+- Total Movements: {analysis[total_movements]}
+- Positive Outcomes: {analysis[positive_outcomes]}
+- Negative Outcomes: {analysis[negative_outcomes]}
+- Average Time Effect: {analysis[avg_time_effect]:.2f}s
+
+DETAILED MOVEMENT LOG:
+""".format
+
+_EMPTY_ANALYSIS = {'total_movements': 0, 'positive_outcomes': 0, 'negative_outcomes': 0, 'avg_time_effect': 0}
 
 class ActivityLogger:
     """Handles all activity logging for the hospital simulation"""
     
     def __init__(self):
-        self.activity_log = []
         self.max_log_size = 200
+        self.activity_log = deque(maxlen=self.max_log_size)
     
     def log_activity(self, message: str, predictive_mode: bool = True, auto_mode: bool = False):
         """Log activity with timestamp and mode information"""
-        timestamp = time.strftime("%H:%M:%S")
-        mode = "PRED" if predictive_mode else "TRAD"
-        auto = "AUTO" if auto_mode else "MAN"
-        
-        formatted_message = f"[{timestamp}] [{mode}] [{auto}] {message}"
+        prefix = _MODE_PREFIX[bool(predictive_mode), bool(auto_mode)]
+        formatted_message = f"[{_now_hms()}] {prefix} {message}"
+        # Bounded deque keeps log manageable
         self.activity_log.append(formatted_message)
         
-        # Keep log manageable
-        if len(self.activity_log) > self.max_log_size:
-            self.activity_log.pop(0)
-        
         return formatted_message
     
     def get_recent_activities(self, count: int = 20) -> List[str]:
         """Get the most recent activities"""
-        return self.activity_log[-count:] if self.activity_log else []
+        # Same window as list[-count:]: count <= 0 starts at index -count (0 returns the whole log)
+        start = max(0, len(self.activity_log) - count) if count > 0 else -count
+        return list(islice(self.activity_log, start, None))
     
     def clear_log(self):
         """Clear the activity log"""
@@ -63,7 +113,7 @@ class MetricsTracker:
             'equipment_activations': 0,
             'examinations_completed': 0,
             'equipment_shutdowns': 0,
-            'time_savings_per_movement': [],
+            'time_savings_per_movement': array('d'),
             'total_time_saved': 0,
             'total_energy_consumed': 0,
             'energy_saved_sleep': 0
@@ -71,32 +121,85 @@ class MetricsTracker:
         self.movement_log = []
         self.start_time = time.time()
         self.last_energy_update = time.time()
+        
+        # Summary ratios, kept current as the metrics they derive from change
+        self._avg_time_per_task = 0
+        self._energy_eff_pct = 0
+        
+        # Summary is rebuilt only after a metric changes
+        self._summary_cache = None
+        self._summary_accuracy = None
+        self._summary_dirty = True
+        
+        # Rolling movement aggregates, updated as each movement is logged
+        self._room_transitions = {}
+        self._actor_performance = {}
+        self._pos_count = 0
+        self._neg_count = 0
+        self._sum_effect = 0
+        self._min_effect = 0
+        self._max_effect = 0
     
     def log_movement(self, movement_info: Dict[str, Any]):
         """Log a movement event with detailed information"""
-        self.movement_log.append(movement_info)
+        movement = Movement.from_dict(movement_info)
+        self.movement_log.append(movement)
+        self._summary_dirty = True
         
         # Update metrics
-        self.metrics['tasks_completed'] += 1
-        self.metrics['manual_movements'] += 1
-        self.metrics['total_delay_saved'] += movement_info.get('time_saved', 0)
-        self.metrics['total_delay_incurred'] += movement_info.get('delay_incurred', 0)
-        self.metrics['total_time_saved'] += movement_info.get('net_effect', 0)
-        self.metrics['time_savings_per_movement'].append(movement_info.get('net_effect', 0))
+        metrics = self.metrics
+        effect = movement.net_effect
+        metrics['tasks_completed'] += 1
+        metrics['manual_movements'] += 1
+        metrics['total_delay_saved'] += movement.time_saved
+        metrics['total_delay_incurred'] += movement.delay_incurred
+        metrics['total_time_saved'] += effect
+        metrics['time_savings_per_movement'].append(effect)
+        self._avg_time_per_task = metrics['total_time_saved'] / metrics['tasks_completed']
+        
+        # Update movement aggregates; [count, total_effect] per group, averaged on read
+        if len(self.movement_log) == 1:
+            self._min_effect = self._max_effect = effect
+        elif effect < self._min_effect:
+            self._min_effect = effect
+        elif effect > self._max_effect:
+            self._max_effect = effect
+        self._sum_effect += effect
+        if effect > 0:
+            self._pos_count += 1
+        elif effect < 0:
+            self._neg_count += 1
+        
+        from_room, to_room, actor_type = _MOVEMENT_KEYS(movement)
+        entry = self._room_transitions.get((from_room, to_room))
+        if entry is None:
+            entry = self._room_transitions[from_room, to_room] = [0, 0]
+        entry[0] += 1
+        entry[1] += effect
+        
+        entry = self._actor_performance.get(actor_type)
+        if entry is None:
+            entry = self._actor_performance[actor_type] = [0, 0]
+        entry[0] += 1
+        entry[1] += effect
     
     def update_energy_metrics(self, energy_consumed: float, sleep_savings: float):
         """Update energy consumption metrics"""
         self.metrics['total_energy_consumed'] += energy_consumed
         self.metrics['energy_saved_sleep'] += sleep_savings
+        self._energy_eff_pct = self.metrics['energy_saved_sleep'] / max(1, self.metrics['total_energy_consumed']) * 100
+        self._summary_dirty = True
     
     
     def get_performance_summary(self, prediction_accuracy: float = 0.0) -> Dict[str, Any]:
         """Generate comprehensive performance summary"""
         runtime = time.time() - self.start_time
-        avg_time_per_task = self.metrics['total_time_saved'] / max(1, self.metrics['tasks_completed'])
-        energy_efficiency = self.metrics['energy_saved_sleep'] / max(1, self.metrics['total_energy_consumed']) * 100
+        if not self._summary_dirty and prediction_accuracy == self._summary_accuracy:
+            summary = dict(self._summary_cache)
+            summary['runtime_minutes'] = runtime / 60
+            return summary
         
-        return {
+        self._summary_cache = {
             'runtime_minutes': runtime / 60,
             'total_tasks': self.metrics['tasks_completed'],
             'examinations': self.metrics['examinations_completed'],
@@ -104,57 +207,39 @@ class MetricsTracker:
             'time_saved_total': self.metrics['total_delay_saved'],
             'time_lost_total': self.metrics['total_delay_incurred'],
             'net_time_benefit': self.metrics['total_time_saved'],
-            'avg_time_per_task': avg_time_per_task,
+            'avg_time_per_task': self._avg_time_per_task,
             'energy_consumed_kwh': self.metrics['total_energy_consumed'] / 1000,
             'energy_saved_kwh': self.metrics['energy_saved_sleep'] / 1000,
-            'energy_efficiency_percent': energy_efficiency,
+            'energy_efficiency_percent': self._energy_eff_pct,
             'resources_preloaded': self.metrics['resources_preloaded']
         }
+        self._summary_accuracy = prediction_accuracy
+        self._summary_dirty = False
+        return dict(self._summary_cache)
     
     def get_movement_analysis(self) -> Dict[str, Any]:
         """Analyze movement patterns and efficiency"""
         if not self.movement_log:
             return {'message': 'No movements recorded yet'}
         
-        # Calculate movement statistics
-        time_effects = [m['net_effect'] for m in self.movement_log]
-        positive_effects = [t for t in time_effects if t > 0]
-        negative_effects = [t for t in time_effects if t < 0]
-        
-        # Room transition analysis
-        room_transitions = {}
-        for movement in self.movement_log:
-            transition = f"{movement['from_room']} → {movement['to_room']}"
-            if transition not in room_transitions:
-                room_transitions[transition] = {'count': 0, 'avg_effect': 0, 'total_effect': 0}
-            room_transitions[transition]['count'] += 1
-            room_transitions[transition]['total_effect'] += movement['net_effect']
-            room_transitions[transition]['avg_effect'] = (
-                room_transitions[transition]['total_effect'] / room_transitions[transition]['count']
-            )
-        
-        # Actor type analysis
-        actor_performance = {}
-        for movement in self.movement_log:
-            actor_type = movement['actor_type']
-            if actor_type not in actor_performance:
-                actor_performance[actor_type] = {'movements': 0, 'total_effect': 0, 'avg_effect': 0}
-            actor_performance[actor_type]['movements'] += 1
-            actor_performance[actor_type]['total_effect'] += movement['net_effect']
-            actor_performance[actor_type]['avg_effect'] = (
-                actor_performance[actor_type]['total_effect'] / actor_performance[actor_type]['movements']
-            )
-        
+        total = len(self.movement_log)
         return {
-            'total_movements': len(self.movement_log),
-            'positive_outcomes': len(positive_effects),
-            'negative_outcomes': len(negative_effects),
-            'neutral_outcomes': len(time_effects) - len(positive_effects) - len(negative_effects),
-            'avg_time_effect': sum(time_effects) / len(time_effects),
-            'best_effect': max(time_effects) if time_effects else 0,
-            'worst_effect': min(time_effects) if time_effects else 0,
-            'room_transitions': room_transitions,
-            'actor_performance': actor_performance
+            'total_movements': total,
+            'positive_outcomes': self._pos_count,
+            'negative_outcomes': self._neg_count,
+            'neutral_outcomes': total - self._pos_count - self._neg_count,
+            'avg_time_effect': self._sum_effect / total,
+            'best_effect': self._max_effect,
+            'worst_effect': self._min_effect,
+            'room_transitions': {
+                f"{from_room} → {to_room}": {'count': count, 'avg_effect': pair_total / count,
+                                             'total_effect': pair_total}
+                for (from_room, to_room), (count, pair_total) in self._room_transitions.items()
+            },
+            'actor_performance': {
+                actor_type: {'movements': count, 'total_effect': type_total, 'avg_effect': type_total / count}
+                for actor_type, (count, type_total) in self._actor_performance.items()
+            }
         }
     
     def export_metrics(self, filename: str = None) -> str:
@@ -162,35 +247,18 @@ class MetricsTracker:
         summary = self.get_performance_summary()
         analysis = self.get_movement_analysis()
         
-        report = f"""
-HOSPITAL SIMULATION METRICS REPORT
-Generated: {time.strftime("%Y-%m-%d %H:%M:%S")}
-========================================
-
-PERFORMANCE SUMMARY:
-- Runtime: {summary['runtime_minutes']:.2f} minutes
-- Total Tasks: {summary['total_tasks']}
-- Examinations: {summary['examinations']}
-- Prediction Accuracy: {summary['prediction_accuracy']:.1f}%
-- Time Saved: {summary['time_saved_total']:.2f}s
-- Time Lost: {summary['time_lost_total']:.2f}s
-- Net Benefit: {summary['net_time_benefit']:.2f}s
-- Energy Consumed: {summary['energy_consumed_kwh']:.3f} kWh
-- Energy Saved: {summary['energy_saved_kwh']:.3f} kWh
-
-MOVEMENT ANALYSIS:
-- Total Movements: {analysis.get('total_movements', 0)}
-- Positive Outcomes: {analysis.get('positive_outcomes', 0)}
-- Negative Outcomes: {analysis.get('negative_outcomes', 0)}
-- Average Time Effect: {analysis.get('avg_time_effect', 0):.2f}s
-
-DETAILED MOVEMENT LOG:
-"""
-        
-        for i, movement in enumerate(self.movement_log, 1):
-            report += f"{i:3d}. {movement['actor_type']} {movement['actor_id']}: "
-            report += f"{movement['from_room']} → {movement['to_room']} "
-            report += f"(Effect: {movement['net_effect']:+.1f}s)\n"
+        # Analysis is a placeholder message until the first movement is logged
+        report_parts = [_REPORT_HEADER_TMPL(
+            generated=time.strftime("%Y-%m-%d %H:%M:%S"),
+            summary=summary,
+            analysis={**_EMPTY_ANALYSIS, **analysis}
+        )]
+        report_parts.extend(
+            f"{i:3d}. {m.actor_type} {m.actor_id}: {m.from_room} → {m.to_room} "
+            f"(Effect: {m.net_effect:+.1f}s)\n"
+            for i, m in enumerate(self.movement_log, 1)
+        )
+        report = "".join(report_parts)
         
         if filename:
             try:
@@ -207,11 +275,25 @@ class PerformanceAnalyzer:
     
     def __init__(self, metrics_tracker: MetricsTracker):
         self.metrics_tracker = metrics_tracker
+        self._rec_cache = OrderedDict()
+        self._rec_cache_size = 32
     
     def generate_recommendations(self, simulation) -> List[str]:
         """Generate optimization recommendations based on current performance"""
-        recommendations = []
         summary = self.metrics_tracker.get_performance_summary(simulation.prediction_engine.prediction_accuracy)
+        net_benefit = summary['net_time_benefit']
+        accuracy = summary['prediction_accuracy']
+        efficiency = summary['energy_efficiency_percent']
+        
+        # Recommendations depend only on which threshold band each metric falls in
+        key = (net_benefit < 0, net_benefit < 10, accuracy < 70, accuracy > 90,
+               efficiency < 5, efficiency > 20, summary['total_tasks'] < 10)
+        cached = self._rec_cache.get(key)
+        if cached is not None:
+            self._rec_cache.move_to_end(key)
+            return list(cached)
+        
+        recommendations = []
         
         # Time efficiency recommendations
         if summary['net_time_benefit'] < 0:
@@ -238,4 +320,7 @@ class PerformanceAnalyzer:
         if not recommendations:
             recommendations.append(" System is performing well across all metrics!")
         
-        return recommendations
\ No newline at end of file
+        self._rec_cache[key] = recommendations
+        if len(self._rec_cache) > self._rec_cache_size:
+            self._rec_cache.popitem(last=False)
+        return list(recommendations)
\ No newline at end of file
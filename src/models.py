@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional
 from enum import Enum
 
 class RoomType(Enum):
@@ -24,8 +24,69 @@ class EquipmentState(Enum):
     SLEEP = "SLEEP"
     SHUTTING_DOWN = "SHUTTING_DOWN"
 
+# Display names looked up directly instead of through Enum.value
+ROOM_NAME = {room_type: room_type.value for room_type in RoomType}
+ACTOR_NAME = {actor_type: actor_type.value for actor_type in ActorType}
+
 @dataclass
-class Position:
-    x: int
-    y: int
-    room: RoomType
\ No newline at end of file
+class Movement:
+    """One logged actor movement between rooms"""
+    __slots__ = ('actor_type', 'actor_id', 'from_room', 'to_room', 'net_effect', 'time_saved', 'delay_incurred')
+    
+    actor_type: Any
+    actor_id: Any
+    from_room: Any
+    to_room: Any
+    net_effect: float
+    time_saved: float
+    delay_incurred: float
+    
+    @classmethod
+    def from_dict(cls, info: Dict[str, Any]) -> 'Movement':
+        """Build a record from a movement info dict, defaulting missing timings to 0"""
+        return cls(info.get('actor_type'), info.get('actor_id'), info.get('from_room'), info.get('to_room'),
+                   info.get('net_effect', 0), info.get('time_saved', 0), info.get('delay_incurred', 0))
+
+class Metrics:
+    """Running counters of a simulation, stored as attributes rather than dict keys"""
+    _FIELDS = ('total_delay_saved', 'total_delay_incurred', 'tasks_completed', 'resources_preloaded',
+               'manual_movements', 'equipment_activations', 'examinations_completed', 'equipment_shutdowns',
+               'time_savings_per_movement', 'total_time_saved', 'total_energy_consumed', 'energy_saved_sleep')
+    # Plain slotted class: slotted dataclass fields cannot carry defaults before Python 3.10
+    __slots__ = _FIELDS + ('version',)
+    
+    def __init__(self):
+        self.total_delay_saved = 0
+        self.total_delay_incurred = 0
+        self.tasks_completed = 0
+        self.resources_preloaded = 0
+        self.manual_movements = 0
+        self.equipment_activations = 0
+        self.examinations_completed = 0
+        self.equipment_shutdowns = 0
+        self.time_savings_per_movement = []
+        self.total_time_saved = 0
+        self.total_energy_consumed = 0
+        self.energy_saved_sleep = 0
+        # Bumped by every mutator below; keys cached summaries built from these counters
+        self.version = 0
+    
+    def record_examination(self):
+        """Count one started examination"""
+        self.examinations_completed += 1
+        self.version += 1
+    
+    def record_shutdowns(self, count: int):
+        """Count devices sent into shutdown"""
+        self.equipment_shutdowns += count
+        self.version += 1
+    
+    def add_energy(self, consumed: float, saved: float):
+        """Accumulate consumed energy and energy saved by sleep mode (Wh)"""
+        self.total_energy_consumed += consumed
+        self.energy_saved_sleep += saved
+        self.version += 1
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dict keyed by metric name"""
+        return {name: getattr(self, name) for name in self._FIELDS}
@@ -1,7 +1,23 @@
 import random
 import time
+from collections import Counter, deque
 from typing import List, Dict, Tuple, Optional
-from models import RoomType, ActorType, EquipmentState, Position
+from models import RoomType, ActorType, EquipmentState, Metrics
+
+# Distance (px) an actor marker is kept from the layout edges
+ACTOR_MARGIN = 15
+
+# Cell size (px) of the room lookup grid; room edges lie on multiples of it
+_ROOM_CELL = 100
+
+# Equipment state groups used for membership tests
+_IDLE_STATES = frozenset({EquipmentState.OFF, EquipmentState.SLEEP})
+_ACTIVE_STATES = frozenset({EquipmentState.READY, EquipmentState.IN_USE, EquipmentState.PRELOADED})
+_USABLE_STATES = frozenset({EquipmentState.READY, EquipmentState.SLEEP, EquipmentState.PRELOADED})
+_POWERED_STATES = _ACTIVE_STATES | {EquipmentState.SLEEP}
+_TRANSITION_STATES = frozenset({EquipmentState.STARTING, EquipmentState.SHUTTING_DOWN})
+# States that can change on their own as time passes
+_TIMED_STATES = _TRANSITION_STATES | {EquipmentState.READY}
 
 class Equipment:
     def __init__(self, name: str, startup_time: float, power_consumption: float = 0):
@@ -10,6 +26,12 @@ class Equipment:
         self.shutdown_time = startup_time * 0.3
         self.power_consumption = power_consumption
         self.sleep_power = power_consumption * 0.1
+        # Draw above sleep level: saved while asleep, ramped in while starting
+        self.active_delta = power_consumption - self.sleep_power
+        # Draw for every state except STARTING, whose draw ramps with progress
+        self._state_power = {state: 0 for state in EquipmentState if state != EquipmentState.STARTING}
+        self._state_power.update(dict.fromkeys(_ACTIVE_STATES, power_consumption))
+        self._state_power[EquipmentState.SLEEP] = self.sleep_power
         self.state = EquipmentState.OFF
         self.state_change_time = 0
         self.last_used = 0
@@ -17,31 +39,36 @@ class Equipment:
         self.sleep_threshold = 10.0
         self.in_use_by = None
         self.preloaded_by_prediction = False
+        self.canvas_ids = {}
+        self.drawn_state = None
     
-    def start_preload(self):
+    def start_preload(self, now: float = None):
         """Start preloading equipment (predictive mode)"""
-        if self.state in [EquipmentState.OFF, EquipmentState.SLEEP]:
+        if self.state in _IDLE_STATES:
             self.state = EquipmentState.STARTING
-            self.state_change_time = time.time()
+            self.state_change_time = time.monotonic() if now is None else now
             self.preloaded_by_prediction = True
             return self.startup_time
         return 0
     
-    def start_manual_activation(self):
+    def start_manual_activation(self, now: float = None):
         """Start manual activation (non-predictive mode)"""
-        if self.state in [EquipmentState.OFF, EquipmentState.SLEEP]:
+        if self.state in _IDLE_STATES:
             self.state = EquipmentState.STARTING
-            self.state_change_time = time.time()
+            self.state_change_time = time.monotonic() if now is None else now
             self.preloaded_by_prediction = False
             return self.startup_time
         return 0
     
-    def update_state(self):
+    def update_state(self, now: float = None):
         """Update equipment state based on elapsed time"""
-        current_time = time.time()
+        if self.state not in _TIMED_STATES:
+            return False
+        
+        current_time = time.monotonic() if now is None else now
         elapsed = current_time - self.state_change_time
         
-        if self.state == EquipmentState.STARTING:
+        if self.state is EquipmentState.STARTING:
             if elapsed >= self.startup_time:
                 if self.preloaded_by_prediction:
                     self.state = EquipmentState.PRELOADED
@@ -49,81 +76,80 @@ class Equipment:
                     self.state = EquipmentState.READY
                     self.idle_start_time = current_time
                 return True
-        elif self.state == EquipmentState.SHUTTING_DOWN:
+        elif self.state is EquipmentState.SHUTTING_DOWN:
             if elapsed >= self.shutdown_time:
                 self.state = EquipmentState.OFF
                 self.in_use_by = None
                 self.preloaded_by_prediction = False
                 return True
-        elif self.state == EquipmentState.READY:
+        elif self.state is EquipmentState.READY:
             if current_time - self.idle_start_time > self.sleep_threshold:
                 self.state = EquipmentState.SLEEP
                 return True
         
         return False
     
-    def get_progress(self):
+    def get_progress(self, now: float = None):
         """Get startup/shutdown progress (0-1)"""
-        if self.state == EquipmentState.STARTING:
-            elapsed = time.time() - self.state_change_time
+        if self.state is EquipmentState.STARTING:
+            elapsed = (time.monotonic() if now is None else now) - self.state_change_time
             return min(1.0, elapsed / self.startup_time)
-        elif self.state == EquipmentState.SHUTTING_DOWN:
-            elapsed = time.time() - self.state_change_time
+        elif self.state is EquipmentState.SHUTTING_DOWN:
+            elapsed = (time.monotonic() if now is None else now) - self.state_change_time
             return min(1.0, elapsed / self.shutdown_time)
         return 0
     
-    def get_current_power_consumption(self):
+    def get_current_power_consumption(self, now: float = None):
         """Get current power consumption based on state"""
-        if self.state in [EquipmentState.READY, EquipmentState.IN_USE, EquipmentState.PRELOADED]:
-            return self.power_consumption
-        elif self.state == EquipmentState.SLEEP:
-            return self.sleep_power
-        elif self.state == EquipmentState.STARTING:
-            progress = self.get_progress()
-            return self.sleep_power + (self.power_consumption - self.sleep_power) * progress
-        else:
-            return 0
+        power = self._state_power.get(self.state)
+        if power is not None:
+            return power
+        
+        # STARTING ramps from sleep draw up to full draw
+        elapsed = (time.monotonic() if now is None else now) - self.state_change_time
+        progress = min(1.0, elapsed / self.startup_time)
+        return self.sleep_power + self.active_delta * progress
     
-    def activate_preloaded(self):
+    def activate_preloaded(self, now: float = None):
         """Activate preloaded equipment"""
-        if self.state == EquipmentState.PRELOADED:
+        if self.state is EquipmentState.PRELOADED:
             self.state = EquipmentState.READY
-            self.idle_start_time = time.time()
+            self.idle_start_time = time.monotonic() if now is None else now
             return True
         return False
     
     def wake_from_sleep(self):
         """Wake equipment from sleep mode"""
-        if self.state == EquipmentState.SLEEP:
+        if self.state is EquipmentState.SLEEP:
             self.state = EquipmentState.READY
-            self.idle_start_time = time.time()
+            self.idle_start_time = time.monotonic()
             return True
         return False
     
     def start_use(self, user_id):
         """Start using equipment"""
-        if ((self.state == EquipmentState.READY) or (self.state == EquipmentState.SLEEP) or (self.state == EquipmentState.PRELOADED)):
+        if self.state in _USABLE_STATES:
             self.state = EquipmentState.IN_USE
             self.in_use_by = user_id
-            self.last_used = time.time()
+            self.last_used = time.monotonic()
             return True
         
         return False
     
     def stop_use(self):
         """Stop using equipment"""
-        if self.state == EquipmentState.IN_USE:
+        if self.state is EquipmentState.IN_USE:
             self.state = EquipmentState.READY
             self.in_use_by = None
-            self.idle_start_time = time.time()
+            self.idle_start_time = time.monotonic()
             return True
         return False
     
-    def start_shutdown(self):
+    def start_shutdown(self, now: float = None):
         """Start shutting down equipment"""
-        if self.state in [EquipmentState.READY, EquipmentState.IN_USE, EquipmentState.PRELOADED, EquipmentState.SLEEP]:
+        if self.state in _POWERED_STATES:
             self.state = EquipmentState.SHUTTING_DOWN
-            self.state_change_time = time.time()
+            self.state_change_time = time.monotonic() if now is None else now
             self.in_use_by = None
             return self.shutdown_time
         return 0
@@ -133,6 +159,7 @@ class Room:
         self.room_type = room_type
         self.position = position
         self.size = size
+        self.center = (position[0] + size[0] // 2, position[1] + size[1] // 2)
         self.equipment = self._initialize_equipment()
         self.occupants = []
         self.staff_present = False
@@ -141,7 +168,7 @@ class Room:
         self.examination_in_progress = False
         self.last_preload_time = 0
         self.equipment_activation_time = 0
-        self.last_occupancy_time = time.time()
+        self.last_occupancy_time = time.monotonic()
     
     def _initialize_equipment(self):
         """Initialize realistic medical equipment with accurate specifications"""
@@ -170,71 +197,58 @@ class Room:
         }
         return equipment_map.get(self.room_type, [])
     
-    def update_occupancy(self, actors):
-        """Update room occupancy based on current actors"""
-        self.staff_present = False
-        self.doctors_present = []
-        self.patients_present = []
+    def assign_occupancy(self, doctors, patients, staff_count: int, now: float = None):
+        """Store this room's occupants, as bucketed by the simulation in one pass over the actors"""
+        self.staff_present = staff_count > 0
+        self.doctors_present = doctors
+        self.patients_present = patients
         
-        for actor in actors:
-            if actor.current_room == self.room_type:
-                if actor.actor_type == ActorType.STAFF:
-                    self.staff_present = True
-                elif actor.actor_type == ActorType.DOCTOR:
-                    self.doctors_present.append(actor)
-                elif actor.actor_type == ActorType.PATIENT:
-                    self.patients_present.append(actor)
-        
-        if self.staff_present or self.doctors_present or self.patients_present:
-            self.last_occupancy_time = time.time()
-    
-    def start_equipment_preload(self):
+        if self.staff_present or doctors or patients:
+            self.last_occupancy_time = time.monotonic() if now is None else now
+    
+    def start_equipment_preload(self, now: float = None):
         """Start preloading equipment (predictive mode)"""
-        total_delay = 0
-        preloaded_count = 0
-        
-        for equipment in self.equipment:
-            if equipment.state in [EquipmentState.OFF, EquipmentState.SLEEP]:
-                delay = equipment.start_preload()
-                total_delay += delay
-                preloaded_count += 1
-        
-        if preloaded_count > 0:
-            self.last_preload_time = time.time()
+        if now is None:
+            now = time.monotonic()
+        idle = [equipment for equipment in self.equipment if equipment.state in _IDLE_STATES]
+        for equipment in idle:
+            equipment.start_preload(now)
+        
+        if idle:
+            self.last_preload_time = now
             
-        return total_delay, preloaded_count
+        return sum(equipment.startup_time for equipment in idle), len(idle)
     
-    def staff_enters_room(self):
+    def staff_enters_room(self, now: float = None):
         """Handle staff entering room - activate equipment"""
-        total_delay = 0
-        activated_count = 0
-        
-        for equipment in self.equipment:
-            if equipment.state in [EquipmentState.OFF, EquipmentState.SLEEP]:
-                delay = equipment.start_manual_activation()
-                total_delay += delay
-                activated_count += 1
-            elif equipment.state == EquipmentState.PRELOADED:
-                equipment.activate_preloaded()
-                activated_count += 1
-        
+        if now is None:
+            now = time.monotonic()
+        idle = [equipment for equipment in self.equipment if equipment.state in _IDLE_STATES]
+        preloaded = [equipment for equipment in self.equipment if equipment.state is EquipmentState.PRELOADED]
+        for equipment in idle:
+            equipment.start_manual_activation(now)
+        for equipment in preloaded:
+            equipment.activate_preloaded(now)
+        
+        activated_count = len(idle) + len(preloaded)
         if activated_count > 0:
-            self.equipment_activation_time = time.time()
+            self.equipment_activation_time = now
         
-        return total_delay, activated_count
+        return sum(equipment.startup_time for equipment in idle), activated_count
+    
+    def tick(self, now: float = None):
+        """Advance timed equipment transitions once for this step"""
+        if now is None:
+            now = time.monotonic()
+        for equipment in self.equipment:
+            equipment.update_state(now)
     
     def check_equipment_ready(self):
-        """Check if all equipment is ready for use"""
-        if not self.equipment:
-            return True
-            
-        all_ready = True
+        """Check if all equipment is ready for use (as of the last tick)"""
         for equipment in self.equipment:
-            equipment.update_state()
-            if equipment.state not in [EquipmentState.READY, EquipmentState.IN_USE, EquipmentState.SLEEP, EquipmentState.PRELOADED]:
-                all_ready = False
-        
-        return all_ready
+            if equipment.state not in _POWERED_STATES:
+                return False
+        return True
     
     def start_examination(self):
         """Start examination if conditions are met"""
@@ -248,7 +262,7 @@ class Room:
             user_id = f"D{doctor.actor_id}-P{patient.actor_id}"
             
             for equipment in self.equipment:
-                if equipment.state in [EquipmentState.READY, EquipmentState.SLEEP, EquipmentState.PRELOADED]:
+                if equipment.state in _USABLE_STATES:
                     equipment.start_use(user_id)
             
             self.examination_in_progress = True
@@ -272,33 +286,32 @@ class Room:
             return True
         return False
     
-    def shutdown_equipment(self):
+    def shutdown_equipment(self, now: float = None):
         """Shutdown all equipment when room is empty for too long"""
-        shutdown_count = 0
-        total_shutdown_time = 0
+        if now is None:
+            now = time.monotonic()
+        if now - self.last_occupancy_time <= 30.0:
+            return 0, 0
         
-        if time.time() - self.last_occupancy_time > 30.0:
-            for equipment in self.equipment:
-                shutdown_time = equipment.start_shutdown()
-                if shutdown_time > 0:
-                    shutdown_count += 1
-                    total_shutdown_time += shutdown_time
+        powered = [equipment for equipment in self.equipment if equipment.state in _POWERED_STATES]
+        for equipment in powered:
+            equipment.start_shutdown(now)
         
-        return shutdown_count, total_shutdown_time
+        return len(powered), sum(equipment.shutdown_time for equipment in powered)
     
-    def should_shutdown(self):
+    def should_shutdown(self, now: float = None):
         """Determine if equipment should be shut down"""
         return (not self.staff_present and 
                 not self.examination_in_progress and 
                 len(self.doctors_present) == 0 and 
                 len(self.patients_present) == 0 and
-                time.time() - self.last_occupancy_time > 30.0)
+                (time.monotonic() if now is None else now) - self.last_occupancy_time > 30.0)
     
-    def get_total_power_consumption(self):
+    def get_total_power_consumption(self, now: float = None):
         """Get total power consumption for this room"""
         total_power = 0
         for equipment in self.equipment:
-            total_power += equipment.get_current_power_consumption()
+            total_power += equipment.get_current_power_consumption(now)
         return total_power
     
     def contains_point(self, x: int, y: int) -> bool:
@@ -306,19 +319,39 @@ class Room:
         w, h = self.size
         return px <= x < px + w and py <= y < py + h
 
+# Room sequence each actor type tends to follow
+_MOVEMENT_PATTERNS = {
+    ActorType.DOCTOR: (RoomType.LOBBY, RoomType.ICU, RoomType.RADIOLOGY, RoomType.LAB, RoomType.LOBBY),
+    ActorType.STAFF: (RoomType.LOBBY, RoomType.ICU, RoomType.RADIOLOGY, RoomType.LAB, RoomType.LOBBY),
+    ActorType.PATIENT: (RoomType.LOBBY, RoomType.RADIOLOGY, RoomType.LAB, RoomType.ICU, RoomType.LOBBY)
+}
+
+# Next room after each room of a pattern (from the room's first occurrence)
+_NEXT_ROOM = {
+    actor_type: {room: pattern[(pattern.index(room) + 1) % len(pattern)] for room in pattern}
+    for actor_type, pattern in _MOVEMENT_PATTERNS.items()
+}
+
+# Candidate rooms when the current room is not part of the pattern
+_FALLBACK_ROOMS = {room_type: tuple(r for r in RoomType if r != room_type) for room_type in RoomType}
+
 class Actor:
     def __init__(self, actor_type: ActorType, actor_id: int, initial_room: RoomType):
         self.actor_type = actor_type
         self.actor_id = actor_id
         self.current_room = initial_room
-        self.position = Position(0, 0, initial_room)
+        # Canvas coordinates; the room is tracked by current_room
+        self.x = 0
+        self.y = 0
         self.movement_history = []
         self.target_room = None
         self.movement_pattern = self._generate_movement_pattern()
         self.canvas_id = None
         self.label_id = None
+        self.tag_label_id = None
+        self.drawn_state = None
         self.being_dragged = False
-        self.last_movement_time = time.time()
+        self.last_movement_time = time.monotonic()
         self.in_examination = False
         self.examination_room = None
         self.auto_movement_target = None
@@ -328,24 +361,17 @@ class Actor:
         self.tag_id = f"{actor_type.value[:1]}{actor_id:03d}"
     
     def _generate_movement_pattern(self):
-        if self.actor_type == ActorType.DOCTOR:
-            return [RoomType.LOBBY, RoomType.ICU, RoomType.RADIOLOGY, RoomType.LAB, RoomType.LOBBY]
-        elif self.actor_type == ActorType.STAFF:
-            return [RoomType.LOBBY, RoomType.ICU, RoomType.RADIOLOGY, RoomType.LAB, RoomType.LOBBY]
-        else:
-            return [RoomType.LOBBY, RoomType.RADIOLOGY, RoomType.LAB, RoomType.ICU, RoomType.LOBBY]
+        return list(_MOVEMENT_PATTERNS[self.actor_type])
     
     def get_next_likely_room(self) -> RoomType:
         if not self.movement_history:
             pattern_start = 1 if len(self.movement_pattern) > 1 else 0
             return self.movement_pattern[pattern_start]
         
-        try:
-            current_index = self.movement_pattern.index(self.current_room)
-            next_index = (current_index + 1) % len(self.movement_pattern)
-            return self.movement_pattern[next_index]
-        except ValueError:
-            return random.choice([r for r in list(RoomType) if r != self.current_room])
+        next_room = _NEXT_ROOM[self.actor_type].get(self.current_room)
+        if next_room is None:
+            return random.choice(_FALLBACK_ROOMS[self.current_room])
+        return next_room
 
 class PredictionEngine:
     def __init__(self):
@@ -353,22 +379,19 @@ class PredictionEngine:
         self.total_predictions = 0
         self.correct_predictions = 0
         self.staff_movement_patterns = {}
-        self.recent_predictions = []
+        self.recent_predictions = deque(maxlen=50)
     
     def learn_staff_pattern(self, staff_actor, rooms):
         """Learn from staff movement patterns"""
         if staff_actor.actor_type == ActorType.STAFF:
+            # Keep only recent movements (last 20)
             if staff_actor.actor_id not in self.staff_movement_patterns:
-                self.staff_movement_patterns[staff_actor.actor_id] = []
+                self.staff_movement_patterns[staff_actor.actor_id] = deque(maxlen=20)
             
             self.staff_movement_patterns[staff_actor.actor_id].append({
                 'room': staff_actor.current_room,
-                'timestamp': time.time()
+                'timestamp': time.monotonic()
             })
-            
-            # Keep only recent movements (last 20)
-            if len(self.staff_movement_patterns[staff_actor.actor_id]) > 20:
-                self.staff_movement_patterns[staff_actor.actor_id].pop(0)
     
     def predict_movement(self, actor, rooms):
         predicted_room = actor.get_next_likely_room()
@@ -381,13 +404,10 @@ class PredictionEngine:
             'predicted_room': predicted_room,
             'current_room': actor.current_room,
             'confidence': confidence,
-            'timestamp': time.time()
+            'timestamp': time.monotonic()
         }
         self.recent_predictions.append(prediction_data)
         
-        if len(self.recent_predictions) > 50:
-            self.recent_predictions.pop(0)
-        
         return predicted_room, confidence
     
     def update_accuracy(self, predicted: RoomType, actual: RoomType):
@@ -396,10 +416,81 @@ class PredictionEngine:
         if self.total_predictions > 0:
             self.prediction_accuracy = (self.correct_predictions / self.total_predictions) * 100
 
+# Auto demo steps as (actor type, target room)
+_AUTO_SEQ = (
+    # Start from Lobby to Emergency Room
+    (ActorType.STAFF, RoomType.EMERGENCY_ROOM),
+    (ActorType.PATIENT, RoomType.EMERGENCY_ROOM),
+    (ActorType.DOCTOR, RoomType.EMERGENCY_ROOM),
+    
+    # Radiology
+    (ActorType.STAFF, RoomType.RADIOLOGY),
+    (ActorType.PATIENT, RoomType.RADIOLOGY),
+    (ActorType.DOCTOR, RoomType.RADIOLOGY),
+    
+    # Laboratory
+    (ActorType.STAFF, RoomType.LAB),
+    (ActorType.PATIENT, RoomType.LAB),
+    (ActorType.DOCTOR, RoomType.LAB),
+    
+    # ICU
+    (ActorType.STAFF, RoomType.ICU),
+    (ActorType.PATIENT, RoomType.ICU),
+    (ActorType.DOCTOR, RoomType.ICU),
+    
+    # Back to Lobby
+    (ActorType.STAFF, RoomType.LOBBY),
+    (ActorType.PATIENT, RoomType.LOBBY),
+    (ActorType.DOCTOR, RoomType.LOBBY),
+)
+
+# Room sequence of the predictive auto demo
+_PREDICTIVE_SEQ = (
+    RoomType.LOBBY,
+    RoomType.EMERGENCY_ROOM,
+    RoomType.RADIOLOGY,
+    RoomType.LAB,
+    RoomType.ICU,
+    RoomType.LOBBY
+)
+
+# Rooms whose equipment the predictive demo preloads when the nurse reaches a room
+_PRELOAD_AHEAD = {
+    RoomType.EMERGENCY_ROOM: (RoomType.RADIOLOGY, RoomType.LAB),
+    RoomType.LAB: (RoomType.ICU,)
+}
+
+# Reciprocals used by the performance summary (Wh -> kWh, seconds -> minutes)
+_INV_KILO = 1e-3
+_INV_MINUTE = 1 / 60
+
+# Rooms that hold equipment the auto demo waits on
+_EQUIPPED_ROOMS = frozenset({RoomType.ICU, RoomType.LAB, RoomType.RADIOLOGY})
+
 class HospitalSimulation:
     def __init__(self):
         self.rooms = self._create_rooms()
+        self._room_bounds = tuple(
+            (room.position[0], room.position[1],
+             room.position[0] + room.size[0], room.position[1] + room.size[1], room_type)
+            for room_type, room in self.rooms.items()
+        )
+        self.layout_width = max(bounds[2] for bounds in self._room_bounds)
+        self.layout_height = max(bounds[3] for bounds in self._room_bounds)
+        # Room covering each grid cell, indexed [x // _ROOM_CELL][y // _ROOM_CELL]
+        self._room_grid = [
+            [self._find_room_bounds(cx * _ROOM_CELL, cy * _ROOM_CELL)
+             for cy in range(-(-self.layout_height // _ROOM_CELL))]
+            for cx in range(-(-self.layout_width // _ROOM_CELL))
+        ]
+        # The room layout is fixed, so the equipped rooms and equipment list never change
+        self._powered_rooms = tuple(room for room in self.rooms.values() if room.equipment)
+        self._all_equipment = tuple(equipment for room in self._powered_rooms for equipment in room.equipment)
         self.actors = []
+        # Next id per actor type; never decremented, so ids stay unique after removals
+        self._actor_count_by_type = Counter()
+        # Actors of each type in insertion order, kept in sync with self.actors
+        self._actors_by_type = {actor_type: [] for actor_type in ActorType}
         self.prediction_engine = PredictionEngine()
         self.running = False
         self.auto_simulation_running = False
@@ -407,25 +498,20 @@ class HospitalSimulation:
         self.current_room = RoomType.LOBBY
         
         # Metrics will be handled by the metrics module
-        self.metrics = {
-            'total_delay_saved': 0,
-            'total_delay_incurred': 0,
-            'tasks_completed': 0,
-            'resources_preloaded': 0,
-            'manual_movements': 0,
-            'equipment_activations': 0,
-            'examinations_completed': 0,
-            'equipment_shutdowns': 0,
-            'time_savings_per_movement': [],
-            'total_time_saved': 0,
-            'total_energy_consumed': 0,
-            'energy_saved_sleep': 0
-        }
+        self.metrics = Metrics()
+        # (metrics version, prediction accuracy, summary) of the last performance summary
+        self._summary_cache = (None, None, None)
         
         self.movement_log = []
         self.auto_simulation_step = 0
-        self.start_time = time.time()
-        self.last_energy_update = time.time()
+        self.start_time = time.monotonic()
+        self.last_energy_update = time.monotonic()
+        
+        # Redraw flags consumed (and cleared) by the GUI scheduler
+        self.dirty = {'equipment': True, 'actors': True, 'metrics': True}
+        self._last_equipment_states = []
+        self._last_occupancy = []
+        self._last_total_power = 0
     
     def _create_rooms(self):
         return {
@@ -441,24 +527,27 @@ class HospitalSimulation:
         """Switch between predictive and non-predictive mode"""
         self.predictive_mode = mode
         if not mode:
-            for room in self.rooms.values():
+            for room in self._powered_rooms:
                 for equipment in room.equipment:
-                    if equipment.state == EquipmentState.PRELOADED:
+                    if equipment.state is EquipmentState.PRELOADED:
                         equipment.state = EquipmentState.OFF
+        self.dirty['equipment'] = True
     
     def add_actor(self, actor_type: ActorType):
-        actor_id = len([a for a in self.actors if a.actor_type == actor_type])
+        actor_id = self._actor_count_by_type[actor_type]
+        self._actor_count_by_type[actor_type] += 1
         initial_room = RoomType.LOBBY
         actor = Actor(actor_type, actor_id, initial_room)
         
         room = self.rooms[initial_room]
-        actor.position.x = room.position[0] + 50 + (actor_id * 40)
-        actor.position.y = room.position[1] + 100 + (actor_id * 20)
+        actor.x = room.position[0] + 50 + (actor_id * 40)
+        actor.y = room.position[1] + 100 + (actor_id * 20)
         
-        actor.position.x = min(actor.position.x, room.position[0] + room.size[0] - 50)
-        actor.position.y = min(actor.position.y, room.position[1] + room.size[1] - 50)
+        actor.x = min(actor.x, room.position[0] + room.size[0] - 50)
+        actor.y = min(actor.y, room.position[1] + room.size[1] - 50)
         
         self.actors.append(actor)
+        self._actors_by_type[actor_type].append(actor)
         return actor
     
     def remove_actor(self, actor):
@@ -468,48 +557,96 @@ class HospitalSimulation:
                 actor.in_examination = False
                 actor.examination_room = None
             self.actors.remove(actor)
+            self._actors_by_type[actor.actor_type].remove(actor)
     
-    def update_all_rooms(self):
+    def update_all_rooms(self, now: float = None):
         """Update all room states and handle equipment transitions"""
-        for room in self.rooms.values():
-            room.update_occupancy(self.actors)
-            room.check_equipment_ready()
+        if now is None:
+            now = time.monotonic()
+        
+        # Bucket actors by room once: [doctors, patients, staff_count] per room
+        actors = self.actors
+        dirty = self.dirty
+        metrics = self.metrics
+        STAFF, DOCTOR, PATIENT = ActorType.STAFF, ActorType.DOCTOR, ActorType.PATIENT
+        buckets = {room_type: [[], [], 0] for room_type in self.rooms}
+        for actor in actors:
+            bucket = buckets[actor.current_room]
+            actor_type = actor.actor_type
+            if actor_type is STAFF:
+                bucket[2] += 1
+            elif actor_type is DOCTOR:
+                bucket[0].append(actor)
+            elif actor_type is PATIENT:
+                bucket[1].append(actor)
+        
+        occupancy = []
+        for room_type, room in self.rooms.items():
+            room.assign_occupancy(*buckets[room_type], now)
+            room.tick(now)
             
             if room.start_examination():
-                self.metrics['examinations_completed'] += 1
+                metrics.record_examination()
+                dirty['actors'] = True
+                dirty['metrics'] = True
             
             if room.check_examination_end():
-                for actor in self.actors:
-                    if actor.examination_room == room.room_type:
+                for actor in actors:
+                    if actor.examination_room is room_type:
                         actor.in_examination = False
                         actor.examination_room = None
+                dirty['actors'] = True
             
-            if room.should_shutdown() and self.predictive_mode:
-                shutdown_count, shutdown_time = room.shutdown_equipment()
+            occupancy.append((room.staff_present, len(room.doctors_present),
+                              len(room.patients_present), room.examination_in_progress))
+        
+        # Equipment needs a redraw when any state changed or a progress bar is animating
+        states = [equipment.state for equipment in self._all_equipment]
+        if (states != self._last_equipment_states or
+            not _TRANSITION_STATES.isdisjoint(states)):
+            dirty['equipment'] = True
+            self._last_equipment_states = states
+        # The panel's room headers show occupancy, which only changes here
+        if occupancy != self._last_occupancy:
+            dirty['equipment'] = True
+            self._last_occupancy = occupancy
+    
+    def shutdown_idle_rooms(self, now: float = None):
+        """Shut down equipment in rooms left empty for too long (predictive mode)"""
+        if now is None:
+            now = time.monotonic()
+        
+        for room in self._powered_rooms:
+            if room.should_shutdown(now):
+                shutdown_count, shutdown_time = room.shutdown_equipment(now)
                 if shutdown_count > 0:
-                    self.metrics['equipment_shutdowns'] += shutdown_count
+                    self.metrics.record_shutdowns(shutdown_count)
+                    self.dirty['equipment'] = True
     
-    def calculate_energy_consumption(self):
+    def calculate_energy_consumption(self, now: float = None):
         """Calculate current energy consumption and sleep savings"""
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         dt = current_time - self.last_energy_update
         self.last_energy_update = current_time
         
         total_power = 0
-        sleep_savings = 0
+        sleep_power_saved = 0
         
-        for room in self.rooms.values():
-            room_power = room.get_total_power_consumption()
-            total_power += room_power
-            
-            for equipment in room.equipment:
-                if equipment.state == EquipmentState.SLEEP:
-                    power_saved = equipment.power_consumption - equipment.sleep_power
-                    sleep_savings += power_saved * dt / 3600
+        SLEEP = EquipmentState.SLEEP
+        # One pass over the equipment accumulates both draw and sleep savings
+        for equipment in self._all_equipment:
+            total_power += equipment.get_current_power_consumption(current_time)
+            if equipment.state is SLEEP:
+                sleep_power_saved += equipment.active_delta
         
+        sleep_savings = sleep_power_saved * dt / 3600
         energy_consumed = total_power * dt / 3600
-        self.metrics['total_energy_consumed'] += energy_consumed
-        self.metrics['energy_saved_sleep'] += sleep_savings
+        if energy_consumed or sleep_savings:
+            self.metrics.add_energy(energy_consumed, sleep_savings)
+        
+        if total_power > 0 or total_power != self._last_total_power:
+            self.dirty['metrics'] = True
+        self._last_total_power = total_power
         
         return total_power, sleep_savings
     
@@ -518,70 +655,46 @@ class HospitalSimulation:
         new_room = self._get_room_from_position(canvas_x, canvas_y)
         old_room = actor.current_room
         # Update actor position
-        actor.position.x = canvas_x + 40
-        actor.position.y = canvas_y
+        actor.x = canvas_x + 40
+        actor.y = canvas_y
 
         if (actor.actor_type == ActorType.PATIENT):
-            actor.position.y += 50
+            actor.y += 50
         
         if (actor.actor_type == ActorType.DOCTOR):
-            actor.position.y -= 50
+            actor.y -= 50
+        
+        actor.x, actor.y = self.clamp_position(actor.x, actor.y)
 
-        actor.position.room = new_room
+        self.dirty['actors'] = True
         if new_room != old_room:
+            # The equipment panel is flagged by the next tick, once occupancy is re-bucketed
+            self.dirty['metrics'] = True
             actor.current_room = new_room
             actor.movement_history.append(old_room)
-            actor.last_movement_time = time.time()
+            actor.last_movement_time = now = time.monotonic()
             # Only activate devices if nurse enters (manual activation)
             if actor.actor_type == ActorType.STAFF and new_room != RoomType.LOBBY:
                 room = self.rooms[new_room]
-                room.staff_enters_room()
+                room.staff_enters_room(now)
 
     def auto_simulation_step_execute(self):
         """Perform one step of automated simulation"""
         if not self.actors:
             return False
         
-        simulation_sequences = [
-            # Start from Lobby to Emergency Room
-            {'actor_type': ActorType.STAFF, 'target_room': RoomType.EMERGENCY_ROOM},
-            {'actor_type': ActorType.PATIENT, 'target_room': RoomType.EMERGENCY_ROOM},
-            {'actor_type': ActorType.DOCTOR, 'target_room': RoomType.EMERGENCY_ROOM},
-
-            # Radiology
-            {'actor_type': ActorType.STAFF, 'target_room': RoomType.RADIOLOGY},
-            {'actor_type': ActorType.PATIENT, 'target_room': RoomType.RADIOLOGY},
-            {'actor_type': ActorType.DOCTOR, 'target_room': RoomType.RADIOLOGY},
-
-            # Laboratory
-            {'actor_type': ActorType.STAFF, 'target_room': RoomType.LAB},
-            {'actor_type': ActorType.PATIENT, 'target_room': RoomType.LAB},
-            {'actor_type': ActorType.DOCTOR, 'target_room': RoomType.LAB},
-
-            # ICU
-            {'actor_type': ActorType.STAFF, 'target_room': RoomType.ICU},
-            {'actor_type': ActorType.PATIENT, 'target_room': RoomType.ICU},
-            {'actor_type': ActorType.DOCTOR, 'target_room': RoomType.ICU},
-            # ICU
-            {'actor_type': ActorType.STAFF, 'target_room': RoomType.LOBBY},
-            {'actor_type': ActorType.PATIENT, 'target_room': RoomType.LOBBY},
-            {'actor_type': ActorType.DOCTOR, 'target_room': RoomType.LOBBY},
-        ]
-        
-        if self.auto_simulation_step < len(simulation_sequences):
-            step = simulation_sequences[self.auto_simulation_step]
+        if self.auto_simulation_step < len(_AUTO_SEQ):
+            actor_type, target_room = _AUTO_SEQ[self.auto_simulation_step]
             
-            actors_of_type = [a for a in self.actors if a.actor_type == step['actor_type']]
+            actors_of_type = self._actors_by_type[actor_type]
             if actors_of_type:
                 actor = actors_of_type[0]
-                target_room = step['target_room']
-                
-                room = self.rooms[target_room]
-                target_x = room.position[0] + room.size[0] // 2
-                target_y = room.position[1] + room.size[1] // 2
+                target_x, target_y = self.rooms[target_room].center
+                current = self.rooms[self.current_room]
+                current.tick()
                 
-                if ((self.current_room != target_room) and (not (self.rooms[self.current_room]).check_equipment_ready()) # if changing room & current room is not ready 
-                    and (self.current_room in [RoomType.ICU, RoomType.LAB, RoomType.RADIOLOGY])):                        # & current room has equipment
+                if ((self.current_room != target_room) and (not current.check_equipment_ready()) # if changing room & current room is not ready 
+                    and (self.current_room in _EQUIPPED_ROOMS)):                        # & current room has equipment
                     print("Waiting")
                 else: 
                     self.move_actor_to_position(actor, target_x, target_y)
@@ -596,16 +709,7 @@ class HospitalSimulation:
         """Perform one step of automated simulation with predictive preloading."""
         if not self.actors:
             return False
-        # Define the sequence
-        sequence = [
-            
-            RoomType.LOBBY,
-            RoomType.EMERGENCY_ROOM,
-            RoomType.RADIOLOGY,
-            RoomType.LAB,
-            RoomType.ICU,
-            RoomType.LOBBY
-        ]
+        sequence = _PREDICTIVE_SEQ
         if not hasattr(self, 'predictive_step'):
             self.predictive_step = 0
             self.predictive_stage = 0
@@ -613,9 +717,7 @@ class HospitalSimulation:
             self.predictive_step = 0
             self.predictive_stage = 0
             return False
-        room = self.rooms[sequence[self.predictive_step]]
-        x = room.position[0] + room.size[0] // 2
-        y = room.position[1] + room.size[1] // 2
+        x, y = self.rooms[sequence[self.predictive_step]].center
         nurse = self.get_actor(ActorType.STAFF)
         doctor = self.get_actor(ActorType.DOCTOR)
         patient = self.get_actor(ActorType.PATIENT)
@@ -625,11 +727,7 @@ class HospitalSimulation:
                 self.move_actor_to_position(nurse, x, y)
                 return True
             # Nurse has just arrived in the new room, now trigger preloading for the next rooms
-            if sequence[self.predictive_step] == RoomType.EMERGENCY_ROOM:
-                self.rooms[RoomType.RADIOLOGY].start_equipment_preload()
-                self.rooms[RoomType.LAB].start_equipment_preload()
-            if sequence[self.predictive_step] == RoomType.LAB:
-                self.rooms[RoomType.ICU].start_equipment_preload()
+            self.preload_rooms(_PRELOAD_AHEAD.get(sequence[self.predictive_step], ()))
             self.predictive_stage = 1
             return True
         elif self.predictive_stage == 1:
@@ -647,37 +745,71 @@ class HospitalSimulation:
             return True
         return False
     
+    def preload_rooms(self, room_types, now: float = None):
+        """Start preloading equipment in several rooms as one batch with a shared start time"""
+        if now is None:
+            now = time.monotonic()
+        total_delay = 0
+        preloaded_count = 0
+        for room_type in room_types:
+            delay, count = self.rooms[room_type].start_equipment_preload(now)
+            total_delay += delay
+            preloaded_count += count
+        return total_delay, preloaded_count
+    
     def reset_predictive_auto_demo(self):
         self.predictive_step = 0
         self.predictive_stage = 0
 
+    def clamp_position(self, x: int, y: int) -> Tuple[int, int]:
+        """Clamp a point so an actor drawn there stays inside the layout"""
+        x = max(ACTOR_MARGIN, min(self.layout_width - ACTOR_MARGIN, x))
+        y = max(ACTOR_MARGIN, min(self.layout_height - ACTOR_MARGIN, y))
+        return x, y
+    
     def _get_room_from_position(self, x: int, y: int) -> RoomType:
-        for room_type, room in self.rooms.items():
-            if room.contains_point(x, y):
+        if 0 <= x < self.layout_width and 0 <= y < self.layout_height:
+            return self._room_grid[int(x) // _ROOM_CELL][int(y) // _ROOM_CELL]
+        return RoomType.LOBBY
+    
+    def _find_room_bounds(self, x: int, y: int) -> RoomType:
+        for x0, y0, x1, y1, room_type in self._room_bounds:
+            if x0 <= x < x1 and y0 <= y < y1:
                 return room_type
         return RoomType.LOBBY
     
     def get_performance_summary(self):
         """Get comprehensive performance summary"""
-        runtime = time.time() - self.start_time
-        avg_time_per_task = self.metrics['total_time_saved'] / max(1, self.metrics['tasks_completed'])
-        energy_efficiency = self.metrics['energy_saved_sleep'] / max(1, self.metrics['total_energy_consumed']) * 100
-        
-        return {
-            'runtime_minutes': runtime / 60,
-            'total_tasks': self.metrics['tasks_completed'],
-            'examinations': self.metrics['examinations_completed'],
-            'prediction_accuracy': self.prediction_engine.prediction_accuracy,
-            'time_saved_total': self.metrics['total_delay_saved'],
-            'time_lost_total': self.metrics['total_delay_incurred'],
-            'net_time_benefit': self.metrics['total_time_saved'],
+        runtime_minutes = (time.monotonic() - self.start_time) * _INV_MINUTE
+        accuracy = self.prediction_engine.prediction_accuracy
+        version, cached_accuracy, summary = self._summary_cache
+        if version == self.metrics.version and cached_accuracy == accuracy:
+            summary = dict(summary)
+            summary['runtime_minutes'] = runtime_minutes
+            return summary
+        
+        metrics = self.metrics
+        avg_time_per_task = metrics.total_time_saved / max(1, metrics.tasks_completed)
+        energy_efficiency = metrics.energy_saved_sleep / max(1, metrics.total_energy_consumed) * 100
+        
+        summary = {
+            'runtime_minutes': runtime_minutes,
+            'total_tasks': metrics.tasks_completed,
+            'examinations': metrics.examinations_completed,
+            'prediction_accuracy': accuracy,
+            'time_saved_total': metrics.total_delay_saved,
+            'time_lost_total': metrics.total_delay_incurred,
+            'net_time_benefit': metrics.total_time_saved,
             'avg_time_per_task': avg_time_per_task,
-            'energy_consumed_kwh': self.metrics['total_energy_consumed'] / 1000,
-            'energy_saved_kwh': self.metrics['energy_saved_sleep'] / 1000,
+            'energy_consumed_kwh': metrics.total_energy_consumed * _INV_KILO,
+            'energy_saved_kwh': metrics.energy_saved_sleep * _INV_KILO,
             'energy_efficiency_percent': energy_efficiency,
-            'resources_preloaded': self.metrics['resources_preloaded']
+            'resources_preloaded': metrics.resources_preloaded
         }
+        self._summary_cache = (metrics.version, accuracy, summary)
+        return dict(summary)
 
     def get_actor(self, actor_type):
         """Return the first actor of the given type, or None if not found."""
-        return next((a for a in self.actors if a.actor_type == actor_type), None)
\ No newline at end of file
+        actors_of_type = self._actors_by_type[actor_type]
+        return actors_of_type[0] if actors_of_type else None
\ No newline at end of file